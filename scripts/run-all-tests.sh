@@ -208,7 +208,7 @@ run_python_tests() {
         pytest_args+=("-v")
     fi
 
-    if [ "$PARALLEL" = true ] && command -v pytest-xdist >/dev/null 2>&1; then
+    if [ "$PARALLEL" = true ] && uv run python -c "import xdist" >/dev/null 2>&1; then
         pytest_args+=("-n" "auto")
     fi
 
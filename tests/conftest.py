@@ -5,9 +5,14 @@ import sys
 # Add utils to path for importing helpers
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from tests.utils.http_helper import http_session
 from tests.utils.logging_helper import test_log_manager, test_logger
-from tests.utils.prometheus_helper import prometheus_helper, prometheus_test_metrics
-import tests.utils.testinfra_prometheus  # Import to register the module
+from tests.utils.prometheus_helper import (
+    prometheus_helper,
+    prometheus_test_metrics,
+    pytest_sessionfinish,
+)
+from tests.utils.testinfra_prometheus import prom  # Also registers the module
 
 # Common fixtures for all tests
 
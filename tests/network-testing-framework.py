@@ -1,12 +1,134 @@
+import errno
 import logging
 import os
+import select
+import selectors
 import socket
 import subprocess
+import sys
 import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _probe_many(hosts: Iterable[str], port: int, timeout: float) -> Dict[str, bool]:
+    """
+    Probe TCP reachability of many hosts at once.
+
+    All connects are issued on non-blocking sockets up front and then waited on
+    together, so the whole batch costs at most `timeout` seconds instead of
+    `timeout` per unreachable host.
+    """
+    results: Dict[str, bool] = {}
+    sel = selectors.DefaultSelector()
+    try:
+        for host in hosts:
+            results[host] = False
+            try:
+                family, type_, proto, _, addr = socket.getaddrinfo(
+                    host, port, type=socket.SOCK_STREAM
+                )[0]
+                sock = socket.socket(family, type_, proto)
+            except OSError as e:
+                logger.warning("Connectivity test failed for %s:%s - %s", host, port, e)
+                continue
+            sock.setblocking(False)
+            err = sock.connect_ex(addr)
+            if err == 0:
+                results[host] = True
+                sock.close()
+            elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                try:
+                    sel.register(sock, selectors.EVENT_WRITE, host)
+                except BaseException:
+                    sock.close()
+                    raise
+            else:
+                logger.warning(
+                    "Connectivity test failed for %s:%s - %s",
+                    host,
+                    port,
+                    os.strerror(err),
+                )
+                sock.close()
+
+        deadline = time.monotonic() + timeout
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                sock, host = key.fileobj, key.data
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                sel.unregister(sock)
+                sock.close()
+                if err == 0:
+                    results[host] = True
+                else:
+                    logger.warning(
+                        "Connectivity test failed for %s:%s - %s",
+                        host,
+                        port,
+                        os.strerror(err),
+                    )
+
+        for key in list(sel.get_map().values()):
+            logger.warning(
+                "Connectivity test failed for %s:%s - timed out", key.data, port
+            )
+            sel.unregister(key.fileobj)
+            key.fileobj.close()
+    finally:
+        # Close any sockets still registered if the loop above raised
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+    return results
+
+
+def _wait_for_connect(
+    host: str, port: int, timeout: float, attempt_timeout: float = 2.0
+) -> bool:
+    """
+    Wait up to `timeout` seconds for host:port to accept a TCP connection.
+
+    Each non-blocking connect is given at most `attempt_timeout` seconds (and
+    never more than what is left of the window). A connect that hasn't resolved
+    by then is abandoned for a fresh one, so a VIP that silently drops SYNs is
+    re-probed every couple of seconds instead of waiting on the kernel's SYN
+    retransmit backoff. A refused connect is retried after a short pause.
+    """
+    addr_info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+    family, type_, proto, _, addr = addr_info
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        with socket.socket(family, type_, proto) as sock:
+            sock.setblocking(False)
+            err = sock.connect_ex(addr)
+            if err == 0:
+                return True
+            if err in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                _, writable, errored = select.select(
+                    [], [sock], [sock], min(attempt_timeout, remaining)
+                )
+                if not (writable or errored):
+                    # No answer within this attempt: start over with a new SYN.
+                    continue
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err == 0:
+                    return True
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "VIP %s:%s not reachable yet (%s)", host, port, os.strerror(err)
+            )
+        # Refused outright: back off briefly before re-issuing the connect.
+        time.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
 
 
 class NetworkTestFramework:
@@ -24,30 +146,28 @@ class NetworkTestFramework:
         self.components = components
         self.external_targets = external_targets
         self.dns_servers = dns_servers or ["8.8.8.8", "1.1.1.1"]
+        # Components and external targets often overlap; resolve each host once.
+        # dict.fromkeys keeps first-seen order so reports stay stable.
+        self._all_targets = tuple(
+            dict.fromkeys(sys.intern(h) for h in components + external_targets)
+        )
 
     # 1. Connectivity Testing
     def test_connectivity(
         self, port: int = 80, timeout: float = 2.0
     ) -> Dict[str, bool]:
-        results = {}
-        for host in self.components:
-            try:
-                with socket.create_connection((host, port), timeout=timeout):
-                    results[host] = True
-            except Exception as e:
-                logging.warning(f"Connectivity test failed for {host}:{port} - {e}")
-                results[host] = False
-        return results
+        # All components are probed concurrently; timeout bounds the whole batch.
+        return _probe_many(self.components, port, timeout)
 
     # 2. DNS Resolution Verification
-    def test_dns_resolution(self, hostnames: List[str]) -> Dict[str, bool]:
+    def test_dns_resolution(self, hostnames: Iterable[str]) -> Dict[str, bool]:
         results = {}
         for hostname in hostnames:
             try:
                 socket.gethostbyname(hostname)
                 results[hostname] = True
             except Exception as e:
-                logging.warning(f"DNS resolution failed for {hostname} - {e}")
+                logger.warning("DNS resolution failed for %s - %s", hostname, e)
                 results[hostname] = False
         return results
 
@@ -64,7 +184,7 @@ class NetworkTestFramework:
                     return float(avg)
             return None
         except Exception as e:
-            logging.warning(f"Latency measurement failed for {host} - {e}")
+            logger.warning("Latency measurement failed for %s - %s", host, e)
             return None
 
     def measure_throughput(
@@ -83,7 +203,9 @@ class NetworkTestFramework:
             mbps = bps / 1e6
             return mbps
         except Exception as e:
-            logging.warning(f"Throughput measurement failed for {host}:{port} - {e}")
+            logger.warning(
+                "Throughput measurement failed for %s:%s - %s", host, port, e
+            )
             return None
 
     # 4. Network Policy Validation
@@ -92,10 +214,10 @@ class NetworkTestFramework:
         # Here, we just attempt from the current host for demonstration
         try:
             with socket.create_connection((dst, port), timeout=2.0):
-                logging.info(f"Network policy allows {src} -> {dst}:{port}")
+                logger.info("Network policy allows %s -> %s:%s", src, dst, port)
                 return True
         except Exception as e:
-            logging.info(f"Network policy blocks {src} -> {dst}:{port} ({e})")
+            logger.info("Network policy blocks %s -> %s:%s (%s)", src, dst, port, e)
             return False
 
     # 5. External Access Testing
@@ -106,7 +228,9 @@ class NetworkTestFramework:
                 with socket.create_connection((host, port), timeout=3.0):
                     results[host] = True
             except Exception as e:
-                logging.warning(f"External access test failed for {host}:{port} - {e}")
+                logger.warning(
+                    "External access test failed for %s:%s - %s", host, port, e
+                )
                 results[host] = False
         return results
 
@@ -122,68 +246,64 @@ class NetworkTestFramework:
         try:
             # Check initial connectivity
             with socket.create_connection((vip, port), timeout=3.0):
-                logging.info(f"Initial connectivity to VIP {vip}:{port} OK.")
+                logger.info("Initial connectivity to VIP %s:%s OK.", vip, port)
             if failover_action:
                 failover_action()
-                logging.info("Failover action triggered. Waiting for failover...")
-                start = time.time()
-                while time.time() - start < timeout:
-                    try:
-                        with socket.create_connection((vip, port), timeout=3.0):
-                            logging.info(
-                                f"Failover successful, VIP {vip}:{port} is reachable."
-                            )
-                            return True
-                    except Exception:
-                        time.sleep(2)
-                logging.warning(
-                    f"Failover test failed: VIP {vip}:{port} not reachable after {timeout}s."
+                logger.info("Failover action triggered. Waiting for failover...")
+                if _wait_for_connect(vip, port, timeout):
+                    logger.info(
+                        "Failover successful, VIP %s:%s is reachable.", vip, port
+                    )
+                    return True
+                logger.warning(
+                    "Failover test failed: VIP %s:%s not reachable after %ss.",
+                    vip,
+                    port,
+                    timeout,
                 )
                 return False
             return True
         except Exception as e:
-            logging.warning(f"Failover test failed: {e}")
+            logger.warning("Failover test failed: %s", e)
             return False
 
     # Run all tests (one-time validation)
     def run_all_tests(self):
-        logging.info("Running connectivity tests...")
+        logger.info("Running connectivity tests...")
         conn_results = self.test_connectivity()
-        logging.info(f"Connectivity results: {conn_results}")
+        logger.info("Connectivity results: %s", conn_results)
 
-        logging.info("Running DNS resolution tests...")
-        dns_results = self.test_dns_resolution(self.components + self.external_targets)
-        logging.info(f"DNS results: {dns_results}")
+        logger.info("Running DNS resolution tests...")
+        dns_results = self.test_dns_resolution(self._all_targets)
+        logger.info("DNS results: %s", dns_results)
 
-        logging.info("Measuring latency to all components...")
+        logger.info("Measuring latency to all components...")
         for host in self.components:
             latency = self.measure_latency(host)
-            logging.info(
-                f"Latency to {host}: {latency} ms"
-                if latency
-                else f"Latency to {host}: failed"
-            )
+            if latency:
+                logger.info("Latency to %s: %s ms", host, latency)
+            else:
+                logger.info("Latency to %s: failed", host)
 
-        logging.info(
+        logger.info(
             "Measuring throughput to all components (requires iperf3 servers)..."
         )
         for host in self.components:
             throughput = self.measure_throughput(host)
-            logging.info(
-                f"Throughput to {host}: {throughput} Mbps"
-                if throughput
-                else f"Throughput to {host}: failed"
-            )
+            if throughput:
+                logger.info("Throughput to %s: %s Mbps", host, throughput)
+            else:
+                logger.info("Throughput to %s: failed", host)
 
-        logging.info("Testing external access...")
+        logger.info("Testing external access...")
         ext_results = self.test_external_access()
-        logging.info(f"External access results: {ext_results}")
+        logger.info("External access results: %s", ext_results)
 
     # Periodic health checks
     def run_periodic_health_checks(self, interval_sec: int = 300):
         def loop():
             while True:
-                logging.info("Starting periodic health check...")
+                logger.info("Starting periodic health check...")
                 self.run_all_tests()
                 time.sleep(interval_sec)
 
@@ -1,8 +1,10 @@
 import socket
+import ssl
 import subprocess
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
 # --- Configuration (adjust for your homelab) ---
 INTERNAL_SERVICES = [
@@ -34,6 +36,25 @@ SECURE_ENDPOINTS = [
 # --- Helpers ---
 
 
+class _SharedTLSAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools all share one SSLContext."""
+
+    def __init__(self, ssl_context, **kwargs):
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+
+# One SSLContext + keep-alive session for all TLS checks, so repeated checks of
+# the same SECURE_ENDPOINTS reuse open connections instead of re-handshaking.
+_ssl_context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+_session = requests.Session()
+_session.mount("https://", _SharedTLSAdapter(_ssl_context))
+
+
 def can_connect(host, port, timeout=2):
     try:
         with socket.create_connection((host, port), timeout=timeout):
@@ -52,7 +73,7 @@ def resolve_dns(name):
 
 def check_tls(url):
     try:
-        resp = requests.get(url, timeout=5, verify=True)
+        resp = _session.get(url, timeout=5, verify=True)
         return resp.url.startswith("https://") and resp.status_code < 500
     except Exception:
         return False
@@ -60,7 +81,7 @@ def check_tls(url):
 
 def check_headers(url, header, expected_value):
     try:
-        resp = requests.get(url, timeout=5)
+        resp = _session.get(url, timeout=5)
         return resp.headers.get(header) == expected_value
     except Exception:
         return False
@@ -69,17 +90,19 @@ def check_headers(url, header, expected_value):
 # --- Tests ---
 
 
-def test_internal_service_discovery_and_dns():
-    for svc in INTERNAL_SERVICES:
-        assert resolve_dns(svc["host"]), f"DNS resolution failed for {svc['host']}"
-        assert can_connect(
-            svc["host"], svc["port"]
-        ), f"Cannot connect to {svc['name']} at {svc['host']}:{svc['port']}"
+# Targets are parametrized rather than looped so pytest-xdist (`-n auto`) can
+# probe them on separate workers instead of summing their timeouts serially.
+@pytest.mark.parametrize("svc", INTERNAL_SERVICES, ids=lambda svc: svc["name"])
+def test_internal_service_discovery_and_dns(svc):
+    assert resolve_dns(svc["host"]), f"DNS resolution failed for {svc['host']}"
+    assert can_connect(
+        svc["host"], svc["port"]
+    ), f"Cannot connect to {svc['name']} at {svc['host']}:{svc['port']}"
 
 
-def test_internal_dns_resolution():
-    for name in INTERNAL_DNS_NAMES:
-        assert resolve_dns(name), f"DNS resolution failed for {name}"
+@pytest.mark.parametrize("name", INTERNAL_DNS_NAMES)
+def test_internal_dns_resolution(name):
+    assert resolve_dns(name), f"DNS resolution failed for {name}"
 
 
 @pytest.mark.parametrize("url", CLOUDFLARE_TUNNEL_URLS)
@@ -108,9 +131,9 @@ def test_network_policy_enforcement():
 @pytest.mark.skipif(
     not SERVICE_MESH_ENDPOINTS, reason="Service mesh endpoints not configured"
 )
-def test_service_mesh_functionality():
-    for host, port in SERVICE_MESH_ENDPOINTS:
-        assert can_connect(host, port), f"Service mesh routing failed for {host}:{port}"
+@pytest.mark.parametrize("host,port", SERVICE_MESH_ENDPOINTS)
+def test_service_mesh_functionality(host, port):
+    assert can_connect(host, port), f"Service mesh routing failed for {host}:{port}"
 
 
 @pytest.mark.parametrize("url", API_GATEWAY_URLS)
@@ -1,14 +1,40 @@
 #!/usr/bin/env python3
 
+import asyncio
+import atexit
+import collections
+import functools
+import importlib.util
+import inspect
 import json
 import logging
 import os
+import selectors
 import subprocess
 import sys
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+import urllib3
+from kubernetes import client, config, watch
+
+try:
+    import orjson
+
+    def _dumps(obj, indent=False):
+        """Serializes obj to JSON bytes (orjson)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+
+    def _dumps(obj, indent=False):
+        """Serializes obj to JSON bytes (stdlib json)."""
+        return json.dumps(obj, indent=2 if indent else None).encode()
+
+
 # --- Configuration ---
 KUBECTL_CONTEXT = os.getenv(
     "KUBECTL_CONTEXT", "homelab-cluster"
@@ -20,53 +46,206 @@ REPORT_DIR = os.getenv("REPORT_DIR", "./recovery_test_reports")
 DEFAULT_TIMEOUT = int(
     os.getenv("DEFAULT_TIMEOUT", "300")
 )  # Default timeout for steps in seconds
+MAX_CONCURRENT_TESTS = int(
+    os.getenv("MAX_CONCURRENT_TESTS", "6")
+)  # Upper bound on test cases running at the same time
+OUTPUT_TAIL_CHARS = int(
+    os.getenv("OUTPUT_TAIL_CHARS", "65536")
+)  # Characters of command output kept per stream after logging
+WATCH_STOP_CHECK_SECONDS = 5  # How often a cancellable watch checks for a stop
+
 
 # --- Logging Setup ---
+class _StepContextFilter(logging.Filter):
+    """Renders the step name injected by the per-step LoggerAdapters, if any."""
+
+    def filter(self, record):
+        step_name = getattr(record, "step_name", None)
+        record.step_context = f"[{step_name}]" if step_name else ""
+        return True
+
+
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.addFilter(_StepContextFilter())
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
+    format="%(asctime)s [%(levelname)s] %(name)s%(step_context)s: %(message)s",
+    handlers=[_log_handler],
 )
 logger = logging.getLogger("RecoveryTester")
+# One logger per step kind; individual steps are told apart via LoggerAdapter
+# context instead of registering a logger per step name.
+_scenario_logger = logging.getLogger("Scenario")
+_recovery_logger = logging.getLogger("Recovery")
+_validation_logger = logging.getLogger("Validation")
+
 
 # --- Safety Warning ---
-logger.critical("=" * 60)
-logger.critical("🚨 SAFETY WARNING 🚨")
-logger.critical("This framework simulates failures and runs recovery actions.")
-logger.critical(
-    "Running this against a PRODUCTION environment is EXTREMELY RISKY and can cause DATA LOSS or OUTAGES."
-)
-logger.critical(
-    "ONLY run this in a DEDICATED, ISOLATED test environment or during scheduled maintenance with full backups."
-)
-logger.critical("Review simulation steps carefully before execution.")
-logger.critical("=" * 60)
-time.sleep(5)  # Give user time to read warning
+def show_safety_warning():
+    """Prints the safety warning, pausing only when a human is likely reading it."""
+    logger.critical("=" * 60)
+    logger.critical("🚨 SAFETY WARNING 🚨")
+    logger.critical("This framework simulates failures and runs recovery actions.")
+    logger.critical(
+        "Running this against a PRODUCTION environment is EXTREMELY RISKY and can cause DATA LOSS or OUTAGES."
+    )
+    logger.critical(
+        "ONLY run this in a DEDICATED, ISOLATED test environment or during scheduled maintenance with full backups."
+    )
+    logger.critical("Review simulation steps carefully before execution.")
+    logger.critical("=" * 60)
+    if sys.stdin.isatty() and not os.environ.get("CI"):
+        time.sleep(5)  # Give user time to read warning
 
 
 # --- Helper Functions ---
-def run_command(command, check=True, timeout=None, capture_output=True, shell=False):
-    """Runs a shell command with logging and timeout."""
-    logger.info(f"Running command: {' '.join(command)}")
+_api_client = None
+
+
+def get_api_client(pool_maxsize=None):
+    """
+    Returns the shared ApiClient for KUBECTL_CONTEXT.
+
+    kubeconfig is parsed once into a Configuration and every API object built
+    on this client reuses its connection pool. `pool_maxsize` only applies when
+    the client is first created; it defaults to room for MAX_CONCURRENT_TESTS
+    worker threads so concurrent tests don't queue for a connection.
+    """
+    global _api_client
+    if _api_client is None:
+        cfg = client.Configuration()
+        config.load_kube_config(context=KUBECTL_CONTEXT, client_configuration=cfg)
+        cfg.connection_pool_maxsize = pool_maxsize or max(16, MAX_CONCURRENT_TESTS * 2)
+        # Absorb transient apiserver errors without failing the whole test
+        cfg.retries = urllib3.util.Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]
+        )
+        _api_client = client.ApiClient(cfg)
+    return _api_client
+
+
+def wait_for_deployment(
+    apps_v1, namespace, name, predicate, timeout_seconds, stop_event=None
+):
+    """
+    Blocks until `predicate(deployment)` holds, using a watch instead of polling.
+
+    Returns the matching V1Deployment, or None if `timeout_seconds` elapses first
+    or `stop_event` (a threading.Event) gets set. With a stop_event the watch is
+    re-opened every few seconds, so a stop request is noticed promptly even when
+    the deployment isn't changing.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+            return None
+        w = watch.Watch()
+        for event in w.stream(
+            apps_v1.list_namespaced_deployment,
+            namespace=namespace,
+            field_selector=f"metadata.name={name}",
+            timeout_seconds=max(
+                1,
+                int(
+                    remaining
+                    if stop_event is None
+                    else min(remaining, WATCH_STOP_CHECK_SECONDS)
+                ),
+            ),
+        ):
+            deployment = event["object"]
+            if predicate(deployment):
+                w.stop()
+                return deployment
+            if stop_event is not None and stop_event.is_set():
+                w.stop()
+                return None
+
+
+def _stream_output(proc, timeout):
+    """
+    Forwards proc's stdout/stderr to the logger line by line as it arrives.
+
+    Returns the last OUTPUT_TAIL_CHARS characters of each stream. Kills the
+    process and raises TimeoutExpired if it outlives `timeout`.
+    """
+    streams = {
+        proc.stdout.fileno(): ("stdout", logger.info, b"", collections.deque()),
+        proc.stderr.fileno(): ("stderr", logger.warning, b"", collections.deque()),
+    }
+    tail_sizes = dict.fromkeys(streams, 0)
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def emit(fd, line):
+        name, log, _, tail = streams[fd]
+        log("Command %s: %s", name, line)
+        tail.append(line)
+        tail_sizes[fd] += len(line) + 1
+        while tail_sizes[fd] > OUTPUT_TAIL_CHARS and len(tail) > 1:
+            tail_sizes[fd] -= len(tail.popleft()) + 1
+
+    with selectors.DefaultSelector() as sel:
+        for fd in streams:
+            sel.register(fd, selectors.EVENT_READ)
+        while sel.get_map():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                proc.kill()
+                proc.wait()
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            for key, _ in sel.select(remaining):
+                fd = key.fd
+                name, log, pending, tail = streams[fd]
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    sel.unregister(fd)
+                    if pending:
+                        emit(fd, pending.decode(errors="replace").rstrip())
+                    continue
+                *lines, pending = (pending + chunk).split(b"\n")
+                streams[fd] = (name, log, pending, tail)
+                for line in lines:
+                    emit(fd, line.decode(errors="replace").rstrip())
+
+    return tuple("\n".join(streams[fd][3]).strip() for fd in streams)
+
+
+def run_command(
+    command, check=True, timeout=None, capture_output=True, shell=False, env=None
+):
+    """Runs a shell command with logging and timeout.
+
+    Captured output is logged as it is produced rather than after the command
+    exits; only the tail of each stream is kept and returned.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running command: %s", " ".join(command))
     try:
-        result = subprocess.run(
+        if not capture_output:
+            subprocess.run(
+                command,
+                check=check,
+                timeout=timeout,
+                shell=shell,  # Use shell=True cautiously
+                env=env,
+            )
+            return None, None  # If not capturing output
+
+        with subprocess.Popen(
             command,
-            stdout=subprocess.PIPE if capture_output else None,
-            stderr=subprocess.PIPE if capture_output else None,
-            check=check,
-            text=True,
-            timeout=timeout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             shell=shell,  # Use shell=True cautiously
-        )
-        if capture_output:
-            stdout_log = result.stdout.strip() if result.stdout else ""
-            stderr_log = result.stderr.strip() if result.stderr else ""
-            if stdout_log:
-                logger.info(f"Command stdout:\n{stdout_log}")
-            if stderr_log:
-                logger.warning(f"Command stderr:\n{stderr_log}")
-            return stdout_log, stderr_log
-        return None, None  # If not capturing output
+            env=env,
+        ) as proc:
+            stdout_log, stderr_log = _stream_output(proc, timeout)
+            returncode = proc.wait()
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, command, output=stdout_log, stderr=stderr_log
+            )
+        return stdout_log, stderr_log
     except subprocess.TimeoutExpired:
         logger.error(f"Command timed out after {timeout}s: {' '.join(command)}")
         raise
@@ -74,9 +253,6 @@ def run_command(command, check=True, timeout=None, capture_output=True, shell=Fa
         logger.error(
             f"Command failed with exit code {e.returncode}: {' '.join(command)}"
         )
-        if capture_output:
-            if e.stderr:
-                logger.error(f"Error output:\n{e.stderr.strip()}")
         raise
     except Exception as e:
         logger.error(f"Failed to run command {' '.join(command)}: {e}")
@@ -90,7 +266,7 @@ class FailureScenario(ABC):
     def __init__(self, name, description):
         self.name = name
         self.description = description
-        self.logger = logging.getLogger(f"Scenario.{name}")
+        self.logger = logging.LoggerAdapter(_scenario_logger, {"step_name": name})
 
     @abstractmethod
     def simulate(self):
@@ -110,7 +286,7 @@ class RecoveryProcedure(ABC):
         self.name = name
         self.description = description
         self.script_path = script_path  # Path to the actual recovery script
-        self.logger = logging.getLogger(f"Recovery.{name}")
+        self.logger = logging.LoggerAdapter(_recovery_logger, {"step_name": name})
 
     @abstractmethod
     def execute(self):
@@ -124,11 +300,15 @@ class ValidationStep(ABC):
     def __init__(self, name, description):
         self.name = name
         self.description = description
-        self.logger = logging.getLogger(f"Validation.{name}")
+        self.logger = logging.LoggerAdapter(_validation_logger, {"step_name": name})
 
     @abstractmethod
-    def validate(self):
-        """Implement logic to validate recovery. Return True if successful, False otherwise."""
+    def validate(self, stop_event=None):
+        """Implement logic to validate recovery. Return True if successful, False otherwise.
+
+        `stop_event` (a threading.Event) is set once the result is no longer
+        needed; long waits should check it and give up early.
+        """
         pass
 
 
@@ -139,10 +319,21 @@ class ValidationStep(ABC):
 class StopDeploymentScenario(FailureScenario):
     """Simulates failure by scaling a deployment to 0 replicas."""
 
-    def __init__(self, name, description, namespace, deployment_name):
+    def __init__(
+        self,
+        name,
+        description,
+        namespace,
+        deployment_name,
+        api_client=None,
+        known_original_replicas=None,
+    ):
         super().__init__(name, description)
         self.namespace = namespace
         self.deployment_name = deployment_name
+        self.apps_v1 = client.AppsV1Api(api_client or get_api_client())
+        # Optional: replica count to restore, skips reading it from the cluster
+        self.known_original_replicas = known_original_replicas
         self.original_replicas = None
 
     def simulate(self):
@@ -150,40 +341,34 @@ class StopDeploymentScenario(FailureScenario):
             f"Simulating failure: Scaling deployment '{self.namespace}/{self.deployment_name}' to 0 replicas."
         )
         try:
-            # Get original replica count
-            stdout, _ = run_command(
-                [
-                    "kubectl",
-                    "get",
-                    "deployment",
-                    self.deployment_name,
-                    "-n",
-                    self.namespace,
-                    "--context",
-                    KUBECTL_CONTEXT,
-                    "-o",
-                    "jsonpath={.spec.replicas}",
-                ]
-            )
-            self.original_replicas = int(stdout) if stdout.isdigit() else 1
+            apps_v1 = self.apps_v1
+            # Get original replica count (via the small /scale subresource)
+            if self.known_original_replicas is not None:
+                self.original_replicas = self.known_original_replicas
+            else:
+                scale = apps_v1.read_namespaced_deployment_scale(
+                    self.deployment_name, self.namespace
+                )
+                replicas = scale.spec.replicas
+                self.original_replicas = replicas if replicas is not None else 1
             self.logger.info(f"Original replica count: {self.original_replicas}")
 
             # Scale down
-            run_command(
-                [
-                    "kubectl",
-                    "scale",
-                    "deployment",
-                    self.deployment_name,
-                    "--replicas=0",
-                    "-n",
-                    self.namespace,
-                    "--context",
-                    KUBECTL_CONTEXT,
-                ]
+            apps_v1.patch_namespaced_deployment_scale(
+                self.deployment_name, self.namespace, body={"spec": {"replicas": 0}}
             )
-            # Wait briefly for scale down to initiate
-            time.sleep(10)
+            # Wait until the scale down has actually taken effect
+            scaled_down = wait_for_deployment(
+                apps_v1,
+                self.namespace,
+                self.deployment_name,
+                lambda d: not d.status.replicas,
+                timeout_seconds=60,
+            )
+            if scaled_down is None:
+                self.logger.warning(
+                    "Deployment still has replicas after 60s; continuing anyway."
+                )
             self.logger.info("Simulation complete: Deployment scaled down.")
         except Exception as e:
             self.logger.error(f"Failed to simulate failure: {e}")
@@ -191,22 +376,24 @@ class StopDeploymentScenario(FailureScenario):
 
     def cleanup(self):
         if self.original_replicas is not None:
-            self.logger.info(
-                f"Cleaning up simulation: Scaling deployment '{self.namespace}/{self.deployment_name}' back to {self.original_replicas} replicas."
-            )
             try:
-                run_command(
-                    [
-                        "kubectl",
-                        "scale",
-                        "deployment",
-                        self.deployment_name,
-                        f"--replicas={self.original_replicas}",
-                        "-n",
-                        self.namespace,
-                        "--context",
-                        KUBECTL_CONTEXT,
-                    ]
+                # Recovery usually scales the deployment back up itself; only
+                # write when the replica count actually needs restoring.
+                scale = self.apps_v1.read_namespaced_deployment_scale(
+                    self.deployment_name, self.namespace
+                )
+                if scale.spec.replicas == self.original_replicas:
+                    self.logger.info(
+                        f"Cleanup no-op: '{self.namespace}/{self.deployment_name}' already has {self.original_replicas} replicas."
+                    )
+                    return
+                self.logger.info(
+                    f"Cleaning up simulation: Scaling deployment '{self.namespace}/{self.deployment_name}' back to {self.original_replicas} replicas."
+                )
+                self.apps_v1.patch_namespaced_deployment_scale(
+                    self.deployment_name,
+                    self.namespace,
+                    body={"spec": {"replicas": self.original_replicas}},
                 )
             except Exception as e:
                 self.logger.error(f"Failed to cleanup simulation: {e}")
@@ -220,30 +407,133 @@ class StopDeploymentScenario(FailureScenario):
 
 # == Recovery Procedures ==
 class ExecuteScriptRecovery(RecoveryProcedure):
-    """Executes a specified recovery script."""
+    """Executes a specified recovery script.
+
+    Scripts run as a ``python3`` subprocess by default. With
+    ``in_process=True``, a script whose entrypoint is ``main(argv, env)`` is
+    imported on first use and called directly instead, avoiding an interpreter
+    start-up per run; its arguments and environment are passed in, never set
+    on the process. Scripts without that entrypoint still use a subprocess.
+    Either way the run is bounded by ``timeout`` seconds.
+    """
+
+    # Loaded script modules (None if not usable in-process) keyed by
+    # (script_path, mtime), so a module is only reused for the same file version
+    _module_cache = {}
+    _module_cache_lock = threading.Lock()
 
-    def __init__(self, name, description, script_name, script_args=None, env_vars=None):
+    def __init__(
+        self,
+        name,
+        description,
+        script_name,
+        script_args=None,
+        env_vars=None,
+        in_process=False,
+        timeout=DEFAULT_TIMEOUT,
+    ):
         script_full_path = os.path.join(RECOVERY_SCRIPT_DIR, script_name)
         super().__init__(name, description, script_full_path)
         self.script_args = script_args or []
         self.env_vars = env_vars or {}
+        self.in_process = in_process
+        self.timeout = timeout
+        # The script location is fixed at construction, so stat it only once
+        self._script_exists = os.path.isfile(self.script_path)
+        self._script_mtime_ns = (
+            os.stat(self.script_path).st_mtime_ns if self._script_exists else None
+        )
+        # Neither the command line nor the environment changes between runs, so
+        # build them once instead of copying os.environ on every execution.
+        self._argv = ("python3", self.script_path, *self.script_args)
+        self._full_env = {**os.environ, **self._script_env_overrides()}
+
+    def _script_env_overrides(self):
+        return {**self.env_vars, "KUBECTL_CONTEXT": KUBECTL_CONTEXT}
+
+    def _load_module(self):
+        """Imports the script for in-process use; returns None if that isn't possible."""
+        key = (self.script_path, self._script_mtime_ns)
+        with self._module_cache_lock:
+            if key in self._module_cache:
+                return self._module_cache[key]
+
+            module_name = (
+                "_recovery_" + os.path.splitext(os.path.basename(self.script_path))[0]
+            )
+            module = None
+            try:
+                spec = importlib.util.spec_from_file_location(
+                    module_name, self.script_path
+                )
+                candidate = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(candidate)
+                main = getattr(candidate, "main", None)
+                if callable(main) and {"argv", "env"} <= set(
+                    inspect.signature(main).parameters
+                ):
+                    module = candidate
+                else:
+                    self.logger.info(
+                        f"{self.script_path} has no main(argv, env) entrypoint, will use a subprocess"
+                    )
+            except Exception as e:
+                self.logger.warning(
+                    f"Could not import {self.script_path} in-process, will use a subprocess: {e}"
+                )
+            self._module_cache[key] = module
+            return module
+
+    def _execute_in_process(self, module):
+        """Runs the script's main() with a timeout; raises CalledProcessError on a non-zero exit."""
+        outcome = {}
+
+        def run_main():
+            try:
+                outcome["code"] = module.main(
+                    argv=list(self._argv[1:]), env=dict(self._full_env)
+                )
+            except SystemExit as e:
+                outcome["code"] = e.code
+            except BaseException as e:
+                outcome["error"] = e
+
+        # A thread can't be killed, so a script outliving the timeout is left
+        # running in the background; the daemon flag keeps it from blocking exit.
+        runner = threading.Thread(
+            target=run_main, name=f"recovery-{self.name}", daemon=True
+        )
+        runner.start()
+        runner.join(self.timeout)
+        if runner.is_alive():
+            self.logger.error(
+                f"Recovery script timed out after {self.timeout}s (left running in the background)"
+            )
+            raise subprocess.TimeoutExpired(self._argv, self.timeout)
+        if "error" in outcome:
+            raise outcome["error"]
+
+        code = outcome.get("code")
+        exit_code = 0 if code is None else code if isinstance(code, int) else 1
+        if exit_code != 0:
+            raise subprocess.CalledProcessError(exit_code, self._argv)
 
     def execute(self):
         self.logger.info(
             f"Executing recovery script: {self.script_path} with args {self.script_args}"
         )
-        if not os.path.exists(self.script_path):
+        if not self._script_exists:
             raise FileNotFoundError(f"Recovery script not found: {self.script_path}")
 
-        command = ["python3", self.script_path] + self.script_args
-        # Prepare environment variables
-        script_env = os.environ.copy()
-        script_env.update(self.env_vars)
-        script_env["KUBECTL_CONTEXT"] = KUBECTL_CONTEXT  # Ensure context is passed
-
         try:
             # Run the script - assume script exits 0 on success, non-zero on failure
-            run_command(command, check=True, timeout=DEFAULT_TIMEOUT)  # Use check=True
+            module = self._load_module() if self.in_process else None
+            if module is not None:
+                self._execute_in_process(module)
+            else:
+                run_command(
+                    self._argv, check=True, timeout=self.timeout, env=self._full_env
+                )  # Use check=True
             self.logger.info("Recovery script executed successfully.")
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Recovery script failed with exit code {e.returncode}.")
@@ -265,63 +555,80 @@ class DeploymentReadyValidation(ValidationStep):
         deployment_name,
         expected_replicas=None,
         min_ready_percent=100,
+        wait_timeout=60,
+        api_client=None,
     ):
         super().__init__(name, description)
         self.namespace = namespace
         self.deployment_name = deployment_name
+        self.apps_v1 = client.AppsV1Api(api_client or get_api_client())
         self.expected_replicas = (
             expected_replicas  # Optional: check against specific number
         )
         self.min_ready_percent = min_ready_percent
+        # Seconds to watch for readiness; 0 = check once
+        self.wait_timeout = wait_timeout
+
+    def _check(self, spec_replicas, ready_replicas):
+        """Returns (is_valid, target_replicas) for the given replica counts."""
+        target_replicas = (
+            self.expected_replicas
+            if self.expected_replicas is not None
+            else spec_replicas
+        )
 
-    def validate(self):
+        if target_replicas == 0:  # If expecting 0 replicas (e.g., testing scale down)
+            is_valid = ready_replicas == 0
+        elif (
+            spec_replicas == 0
+        ):  # If spec is 0 but we expect > 0 (should not happen in recovery)
+            is_valid = False
+        else:
+            ready_percent = (ready_replicas / spec_replicas) * 100
+            is_valid = (
+                ready_replicas >= target_replicas
+                and ready_percent >= self.min_ready_percent
+            )
+        return is_valid, target_replicas
+
+    @staticmethod
+    def _replica_counts(deployment):
+        return deployment.spec.replicas or 0, deployment.status.ready_replicas or 0
+
+    def validate(self, stop_event=None):
         self.logger.info(
             f"Validating deployment '{self.namespace}/{self.deployment_name}' readiness..."
         )
         try:
-            stdout, _ = run_command(
-                [
-                    "kubectl",
-                    "get",
-                    "deployment",
-                    self.deployment_name,
-                    "-n",
-                    self.namespace,
-                    "--context",
-                    KUBECTL_CONTEXT,
-                    "-o",
-                    "json",
-                ],
-                timeout=60,
-            )
-            if not stdout:
-                self.logger.error("Failed to get deployment status.")
-                return False
-
-            deployment = json.loads(stdout)
-            spec_replicas = deployment.get("spec", {}).get("replicas", 0)
-            ready_replicas = deployment.get("status", {}).get("readyReplicas", 0)
-
-            target_replicas = (
-                self.expected_replicas
-                if self.expected_replicas is not None
-                else spec_replicas
+            # Skip building the full V1Deployment model; only two fields are needed
+            response = self.apps_v1.read_namespaced_deployment_status(
+                self.deployment_name,
+                self.namespace,
+                _preload_content=False,
+                _request_timeout=60,
             )
+            deployment = json.loads(response.data)
+            spec_replicas = deployment.get("spec", {}).get("replicas") or 0
+            ready_replicas = deployment.get("status", {}).get("readyReplicas") or 0
+            is_valid, target_replicas = self._check(spec_replicas, ready_replicas)
 
-            if (
-                target_replicas == 0
-            ):  # If expecting 0 replicas (e.g., testing scale down)
-                is_valid = ready_replicas == 0
-            elif (
-                spec_replicas == 0
-            ):  # If spec is 0 but we expect > 0 (should not happen in recovery)
-                is_valid = False
-            else:
-                ready_percent = (ready_replicas / spec_replicas) * 100
-                is_valid = (
-                    ready_replicas >= target_replicas
-                    and ready_percent >= self.min_ready_percent
+            if not is_valid and self.wait_timeout:
+                self.logger.info(
+                    f"Not ready yet ({ready_replicas}/{spec_replicas}); watching for up to {self.wait_timeout}s..."
                 )
+                ready = wait_for_deployment(
+                    self.apps_v1,
+                    self.namespace,
+                    self.deployment_name,
+                    lambda d: self._check(*self._replica_counts(d))[0],
+                    timeout_seconds=self.wait_timeout,
+                    stop_event=stop_event,
+                )
+                if ready is not None:
+                    spec_replicas, ready_replicas = self._replica_counts(ready)
+                    is_valid, target_replicas = self._check(
+                        spec_replicas, ready_replicas
+                    )
 
             if is_valid:
                 self.logger.info(
@@ -343,20 +650,130 @@ class DeploymentReadyValidation(ValidationStep):
 
 # --- Recovery Tester Class ---
 class RecoveryTester:
-    def __init__(self, report_dir=REPORT_DIR):
+    def __init__(self, report_dir=REPORT_DIR, max_workers=MAX_CONCURRENT_TESTS):
         self.report_dir = report_dir
         self.results = []
+        # Blocking steps (kubectl/API calls, recovery scripts) run here so
+        # independent test cases can overlap.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="recovery-test"
+        )
+        self._target_locks = {}
+        # Load kubeconfig up front so a bad context fails before any simulation
+        self.api_client = get_api_client(pool_maxsize=max(16, max_workers * 2))
+        self.apps_v1 = client.AppsV1Api(self.api_client)
         if not os.path.exists(self.report_dir):
             os.makedirs(self.report_dir)
+        # Per-test results are appended to one buffered JSONL file and synced
+        # once in close(), rather than written to a new file per test.
+        self.runs_report_path = os.path.join(self.report_dir, "runs.jsonl")
+        self._report_fp = open(self.runs_report_path, "ab", buffering=1 << 16)
+        atexit.register(self._close_report)
+
+    async def _run_blocking(self, fn):
+        """Runs a blocking callable on the tester's executor."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+
+    def _target_lock(self, scenario):
+        """Returns the lock serializing test cases that disrupt the same target."""
+        key = (
+            getattr(scenario, "namespace", None),
+            getattr(scenario, "deployment_name", scenario.name),
+        )
+        lock = self._target_locks.get(key)
+        if lock is None:
+            lock = self._target_locks[key] = asyncio.Lock()
+        return lock
+
+    async def _run_validations(self, validations, run_all_validations):
+        """
+        Runs independent read-only validations together.
+
+        Unless run_all_validations is set, checks still pending when one fails
+        are cancelled and left out of the results. Their worker threads are told
+        to stop too, so they don't keep watching the API in the background.
+        Results keep definition order.
+        """
+        stop_event = threading.Event()
+        tasks = [
+            asyncio.create_task(self._run_validation(v, stop_event))
+            for v in validations
+        ]
+        if run_all_validations:
+            return list(await asyncio.gather(*tasks))
+        for finished in asyncio.as_completed(tasks):
+            if not (await finished)["success"]:
+                stop_event.set()
+                for task in tasks:
+                    task.cancel()
+                break
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return [task.result() for task in tasks if not task.cancelled()]
+
+    async def _run_validation(self, validation, stop_event=None):
+        """Runs one validation step and returns its step result."""
+        step_start = time.monotonic()
+        logger.info(f"Running validation: '{validation.name}'...")
+        try:
+            step_success = await self._run_blocking(
+                functools.partial(validation.validate, stop_event=stop_event)
+            )
+            error = None if step_success else "Validation check failed"
+        except Exception as e:
+            logger.error(f"Validation '{validation.name}' raised an error: {e}")
+            step_success = False
+            error = str(e)
+        return {
+            "step": "validate",
+            "name": validation.name,
+            "success": step_success,
+            "duration": time.monotonic() - step_start,
+            "error": error,
+        }
+
+    def close(self):
+        """Releases the executor and flushes buffered per-test reports to disk."""
+        self._executor.shutdown(wait=True)
+        self._close_report()
+
+    def _close_report(self):
+        if self._report_fp.closed:
+            return
+        try:
+            self._report_fp.flush()
+            os.fsync(self._report_fp.fileno())
+        except Exception as e:
+            logger.error(f"Failed to flush report {self.runs_report_path}: {e}")
+        finally:
+            self._report_fp.close()
+
+    async def run_test(
+        self,
+        scenario: FailureScenario,
+        procedure: RecoveryProcedure,
+        validations: list[ValidationStep],
+        run_all_validations: bool = False,
+    ):
+        """Runs a single recovery test case.
 
-    def run_test(
+        Test cases targeting the same namespace/deployment are serialized;
+        all others may run concurrently. Validation stops at the first failed
+        check unless run_all_validations is set.
+        """
+        async with self._target_lock(scenario):
+            await self._run_test(scenario, procedure, validations, run_all_validations)
+
+    async def _run_test(
         self,
         scenario: FailureScenario,
         procedure: RecoveryProcedure,
         validations: list[ValidationStep],
+        run_all_validations: bool,
     ):
-        """Runs a single recovery test case."""
+        # Wall-clock time is only used for the report timestamps; all durations
+        # come from the monotonic clock.
         start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         test_name = f"{scenario.name}__{procedure.name}"
         logger.info(f"--- Starting Test: {test_name} ---")
         result = {
@@ -373,18 +790,26 @@ class RecoveryTester:
         simulate_success = False
         recovery_success = False
         validation_success = False
-        simulation_start_time = None
-        recovery_start_time = None
-        recovery_end_time = None
+        recovery_start_ns = None
+        recovery_end_ns = None
+        # Steps indexed by (step, name), plus the step kinds that have failed,
+        # so error handling never has to rescan result["steps"].
+        step_index = {}
+        failed_steps = set()
+
+        def record_step(step):
+            result["steps"].append(step)
+            step_index[(step["step"], step["name"])] = step
+            if not step["success"]:
+                failed_steps.add(step["step"])
 
         try:
             # 1. Simulate Failure
             step_start = time.monotonic()
             logger.info(f"Step 1: Simulating failure '{scenario.name}'...")
-            simulation_start_time = datetime.now()
-            scenario.simulate()
+            await self._run_blocking(scenario.simulate)
             simulate_success = True
-            result["steps"].append(
+            record_step(
                 {
                     "step": "simulate",
                     "name": scenario.name,
@@ -398,11 +823,11 @@ class RecoveryTester:
             # 2. Execute Recovery
             step_start = time.monotonic()
             logger.info(f"Step 2: Executing recovery procedure '{procedure.name}'...")
-            recovery_start_time = datetime.now()
-            procedure.execute()
+            recovery_start_ns = time.monotonic_ns()
+            await self._run_blocking(procedure.execute)
             recovery_success = True
-            recovery_end_time = datetime.now()
-            result["steps"].append(
+            recovery_end_ns = time.monotonic_ns()
+            record_step(
                 {
                     "step": "recover",
                     "name": procedure.name,
@@ -415,81 +840,44 @@ class RecoveryTester:
 
             # 3. Validate Recovery
             logger.info("Step 3: Validating recovery...")
-            all_validations_passed = True
-            validation_step_results = []
-            for validation in validations:
-                step_start = time.monotonic()
-                logger.info(f"Running validation: '{validation.name}'...")
-                step_success = validation.validate()
-                validation_step_results.append(
-                    {
-                        "step": "validate",
-                        "name": validation.name,
-                        "success": step_success,
-                        "duration": time.monotonic() - step_start,
-                        "error": None if step_success else "Validation check failed",
-                    }
-                )
-                if not step_success:
-                    all_validations_passed = False
-                    # Optionally stop further validations on first failure
-                    # break
-            result["steps"].extend(validation_step_results)
+            step_start = time.monotonic()
+            validation_step_results = await self._run_validations(
+                validations, run_all_validations
+            )
+            all_validations_passed = all(
+                step["success"] for step in validation_step_results
+            )
+            for step in validation_step_results:
+                record_step(step)
             validation_success = all_validations_passed
             logger.info(
                 f"Validation step completed. Overall success: {validation_success}"
             )
 
         except Exception as e:
-            step_name = "unknown"
             current_step_result = {
                 "success": False,
                 "duration": time.monotonic() - step_start,
                 "error": str(e),
             }
             if not simulate_success:
-                step_name = "simulate"
-                current_step_result["name"] = scenario.name
+                step_name, name = "simulate", scenario.name
             elif not recovery_success:
-                step_name = "recover"
-                current_step_result["name"] = procedure.name
-                recovery_end_time = datetime.now()  # Record end time even on failure
+                step_name, name = "recover", procedure.name
+                recovery_end_ns = time.monotonic_ns()  # Record end time even on failure
             else:  # Error during validation phase
-                step_name = "validate"
-                # Error is already captured in validation_step_results if it was a validation failure
-                # This catches errors *running* the validation code itself.
-                if not any(
-                    s["step"] == "validate" and s["error"] for s in result["steps"]
-                ):
-                    result["steps"].append(
-                        {
-                            "step": "validate",
-                            "name": "framework_error",
-                            **current_step_result,
-                        }
-                    )
+                # Failed checks are already recorded by _run_validation; this
+                # catches errors *running* the validation framework itself.
+                step_name, name = "validate", "framework_error"
 
             logger.error(f"Test failed during step '{step_name}': {e}")
             # Ensure failed step is recorded if not already
-            if not any(
-                s["step"] == step_name and not s["success"] for s in result["steps"]
-            ):
-                # Find the step dict if it exists, update it, otherwise add it
-                step_dict = next(
-                    (s for s in result["steps"] if s["step"] == step_name), None
-                )
-                if step_dict:
-                    step_dict.update(current_step_result)
+            if step_name not in failed_steps:
+                existing = step_index.get((step_name, name))
+                if existing is not None:
+                    existing.update(current_step_result)
                 else:
-                    # Need a name if adding fresh
-                    name = (
-                        scenario.name
-                        if step_name == "simulate"
-                        else procedure.name
-                        if step_name == "recover"
-                        else "validation_framework"
-                    )
-                    result["steps"].append(
+                    record_step(
                         {"step": step_name, "name": name, **current_step_result}
                     )
 
@@ -498,8 +886,8 @@ class RecoveryTester:
             step_start = time.monotonic()
             logger.info("Step 4: Cleaning up simulation...")
             try:
-                scenario.cleanup()
-                result["steps"].append(
+                await self._run_blocking(scenario.cleanup)
+                record_step(
                     {
                         "step": "cleanup",
                         "name": scenario.name,
@@ -511,7 +899,7 @@ class RecoveryTester:
                 logger.info("Cleanup step completed.")
             except Exception as e:
                 logger.error(f"Cleanup failed: {e}")
-                result["steps"].append(
+                record_step(
                     {
                         "step": "cleanup",
                         "name": scenario.name,
@@ -521,18 +909,17 @@ class RecoveryTester:
                     }
                 )
 
-            end_time = datetime.now()
-            result["end_time"] = end_time.isoformat()
+            result["end_time"] = datetime.now().isoformat()
             result["success"] = (
                 simulate_success and recovery_success and validation_success
             )
-            result["total_duration_seconds"] = (end_time - start_time).total_seconds()
-            if recovery_start_time and recovery_end_time:
+            result["total_duration_seconds"] = (time.monotonic_ns() - start_ns) / 1e9
+            if recovery_start_ns is not None and recovery_end_ns is not None:
                 # RTO approximation: time from start of recovery to end of recovery execution
                 # More accurate RTO includes validation time until service is confirmed usable.
                 result["recovery_duration_seconds"] = (
-                    recovery_end_time - recovery_start_time
-                ).total_seconds()
+                    recovery_end_ns - recovery_start_ns
+                ) / 1e9
 
             self.results.append(result)
             logger.info(
@@ -541,15 +928,12 @@ class RecoveryTester:
             self.save_report(test_name, result)
 
     def save_report(self, test_name, result_data):
-        """Saves the result of a single test to a JSON file."""
-        report_filename = f"{test_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        report_path = os.path.join(self.report_dir, report_filename)
-        logger.info(f"Saving report to {report_path}")
+        """Appends the result of a single test as one line of runs.jsonl."""
+        logger.info(f"Saving report for {test_name} to {self.runs_report_path}")
         try:
-            with open(report_path, "w") as f:
-                json.dump(result_data, f, indent=2)
+            self._report_fp.write(_dumps(result_data) + b"\n")
         except Exception as e:
-            logger.error(f"Failed to save report {report_path}: {e}")
+            logger.error(f"Failed to save report for {test_name}: {e}")
 
     def generate_summary_report(self):
         """Generates a summary of all test runs."""
@@ -592,15 +976,15 @@ class RecoveryTester:
         # Save summary (optional)
         summary_path = os.path.join(self.report_dir, "summary_report.json")
         try:
-            with open(summary_path, "w") as f:
-                json.dump(self.results, f, indent=2)
+            with open(summary_path, "wb") as f:
+                f.write(_dumps(self.results, indent=True))
             logger.info(f"Summary report saved to {summary_path}")
         except Exception as e:
             logger.error(f"Failed to save summary report: {e}")
 
 
 # --- Test Definitions ---
-def define_test_cases():
+def define_test_cases(api_client=None):
     """Define the specific test cases to run."""
     test_cases = []
 
@@ -613,6 +997,7 @@ def define_test_cases():
         description=f"Stop deployment {app_deploy} by scaling to 0",
         namespace=app_ns,
         deployment_name=app_deploy,
+        api_client=api_client,
     )
     recovery1 = ExecuteScriptRecovery(
         name="RecoverServiceScript",
@@ -627,6 +1012,7 @@ def define_test_cases():
         namespace=app_ns,
         deployment_name=app_deploy,
         min_ready_percent=100,  # Expect full recovery
+        api_client=api_client,
     )
     test_cases.append(
         {"scenario": scenario1, "procedure": recovery1, "validations": [validation1]}
@@ -641,29 +1027,25 @@ def define_test_cases():
     return test_cases
 
 
-# --- Main Execution ---
-if __name__ == "__main__":
-    logger.info("Initializing Recovery Testing Framework...")
-    tester = RecoveryTester()
-    test_definitions = define_test_cases()
-
-    if not test_definitions:
-        logger.warning("No test cases defined. Exiting.")
-        sys.exit(0)
-
-    logger.info(f"Found {len(test_definitions)} test cases to run.")
-
-    for test_case in test_definitions:
-        try:
+async def run_test_cases(tester, test_definitions):
+    """Runs all test cases concurrently, bounded by the tester's executor."""
+    outcomes = await asyncio.gather(
+        *(
             tester.run_test(
                 scenario=test_case["scenario"],
                 procedure=test_case["procedure"],
                 validations=test_case["validations"],
+                run_all_validations=test_case.get("run_all_validations", False),
             )
-        except Exception as e:
+            for test_case in test_definitions
+        ),
+        return_exceptions=True,
+    )
+    for test_case, e in zip(test_definitions, outcomes):
+        if isinstance(e, Exception):
             logger.critical(
                 f"Unhandled exception during test execution for {test_case.get('scenario',{}).name}: {e}",
-                exc_info=True,
+                exc_info=e,
             )
             # Optionally record this critical failure in the report
             tester.results.append(
@@ -685,6 +1067,25 @@ if __name__ == "__main__":
                 }
             )
 
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    show_safety_warning()
+    logger.info("Initializing Recovery Testing Framework...")
+    tester = RecoveryTester()
+    test_definitions = define_test_cases(api_client=tester.api_client)
+
+    if not test_definitions:
+        logger.warning("No test cases defined. Exiting.")
+        sys.exit(0)
+
+    logger.info(f"Found {len(test_definitions)} test cases to run.")
+
+    try:
+        asyncio.run(run_test_cases(tester, test_definitions))
+    finally:
+        tester.close()
+
     tester.generate_summary_report()
 
     # Exit with non-zero code if any test failed
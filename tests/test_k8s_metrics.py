@@ -1,13 +1,12 @@
 import pytest
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 @pytest.mark.prometheus
 @pytest.mark.k8s
-def test_cluster_health(host, prometheus_test_metrics):
+def test_cluster_health(prom, prometheus_test_metrics):
     """Test K3s cluster health using Prometheus metrics"""
-    prom = host.prometheus
-
     # Check node status
     query = 'kube_node_status_condition{condition="Ready", status="true"}'
     assert prom.check_metric_exists(query), "No nodes are in Ready state"
@@ -43,9 +42,20 @@ def test_resource_utilization(host, prometheus_test_metrics):
     """Test that resource utilization is within acceptable limits"""
     prom = host.prometheus
 
+    cpu_query = '100 - (avg by (instance) (irate(node_cpu_seconds_total{mode="idle"}[5m])) * 100)'
+    mem_query = '100 * (node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) / node_memory_MemTotal_bytes'
+    disk_query = '100 - ((node_filesystem_avail_bytes{mountpoint="/"} * 100) / node_filesystem_size_bytes{mountpoint="/"})'
+
+    # The three queries are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        cpu_future = executor.submit(prom.query, cpu_query)
+        mem_future = executor.submit(prom.query, mem_query)
+        disk_future = executor.submit(prom.query, disk_query)
+        cpu_result = cpu_future.result()
+        mem_result = mem_future.result()
+        disk_result = disk_future.result()
+
     # Check CPU utilization is below 90%
-    query = '100 - (avg by (instance) (irate(node_cpu_seconds_total{mode="idle"}[5m])) * 100)'
-    cpu_result = prom.query(query)
 
     if cpu_result.get("status") == "success" and cpu_result.get("data", {}).get("result"):
         cpu_usage = float(cpu_result["data"]["result"][0]["value"][1])
@@ -58,8 +68,6 @@ def test_resource_utilization(host, prometheus_test_metrics):
         assert cpu_usage < 90, f"CPU usage too high: {cpu_usage}%"
 
     # Check memory utilization is below 90%
-    query = '100 * (node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) / node_memory_MemTotal_bytes'
-    mem_result = prom.query(query)
 
     if mem_result.get("status") == "success" and mem_result.get("data", {}).get("result"):
         mem_usage = float(mem_result["data"]["result"][0]["value"][1])
@@ -72,8 +80,6 @@ def test_resource_utilization(host, prometheus_test_metrics):
         assert mem_usage < 90, f"Memory usage too high: {mem_usage}%"
 
     # Check disk utilization is below 85%
-    query = '100 - ((node_filesystem_avail_bytes{mountpoint="/"} * 100) / node_filesystem_size_bytes{mountpoint="/"})'
-    disk_result = prom.query(query)
 
     if disk_result.get("status") == "success" and disk_result.get("data", {}).get("result"):
         disk_usage = float(disk_result["data"]["result"][0]["value"][1])
@@ -86,32 +92,30 @@ def test_resource_utilization(host, prometheus_test_metrics):
         assert disk_usage < 85, f"Disk usage too high: {disk_usage}%"
 
 @pytest.mark.prometheus
-def test_pulumi_deployment_health(host):
+def test_pulumi_deployment_health(prom):
     """Test that Pulumi deployments are successful"""
-    prom = host.prometheus
-
     # Check core stacks
     stacks = ["cluster-setup", "core-services", "storage"]
 
+    # One bulk fetch for all stacks up front
+    snapshot = prom.bulk_pulumi_snapshot(stacks)
+
     for stack in stacks:
-        # Check if we have metrics for this stack (skip if not deployed)
-        if prom.check_metric_exists(f'pulumi_deployments_total{{project="{stack}"}}'):
-            # Verify most recent deployment was successful
-            assert prom.has_pulumi_success(stack), f"Latest Pulumi deployment for {stack} was not successful"
-
-            # Check deployment duration is reasonable
-            duration_query = f'pulumi_deployment_duration_seconds{{project="{stack}"}}'
-            duration_result = prom.query(duration_query)
-
-            if duration_result.get("status") == "success" and duration_result.get("data", {}).get("result"):
-                duration = float(duration_result["data"]["result"][0]["value"][1])
-                assert duration > 0, f"Deployment duration for {stack} should be greater than 0"
-                assert duration < 3600, f"Deployment duration for {stack} is suspiciously long: {duration}s"
-
-            # Verify resource creation metrics
-            resource_query = f'pulumi_resources_created{{project="{stack}"}}'
-            if prom.check_metric_exists(resource_query):
-                resources_result = prom.query(resource_query)
-                if resources_result.get("status") == "success" and resources_result.get("data", {}).get("result"):
-                    resources = float(resources_result["data"]["result"][0]["value"][1])
-                    assert resources >= 0, "Resource count cannot be negative"
+        # Skip stacks without success metrics (stack may not have been deployed)
+        stack_metrics = snapshot.get(stack, {})
+        if "success" not in stack_metrics:
+            continue
+
+        # Verify most recent deployment was successful
+        assert stack_metrics.get("success") == 1, f"Latest Pulumi deployment for {stack} was not successful"
+
+        # Check deployment duration is reasonable
+        duration = stack_metrics.get("duration")
+        if duration is not None:
+            assert duration > 0, f"Deployment duration for {stack} should be greater than 0"
+            assert duration < 3600, f"Deployment duration for {stack} is suspiciously long: {duration}s"
+
+        # Verify resource creation metrics
+        resources = stack_metrics.get("resources")
+        if resources is not None:
+            assert resources >= 0, "Resource count cannot be negative"
@@ -1,18 +1,12 @@
 import pytest
-import time
 import random
 
 
 @pytest.mark.metrics
 def test_basic_metrics_collection(test_metrics):
     """Test that basic metrics collection works"""
-    # Create a custom metric
-    custom_counter = test_metrics.create_custom_metric(
-        'test_custom_counter',
-        'A custom counter for testing',
-        'counter',
-        ['test_type']
-    )
+    # Custom metric registered up front by the metrics manager
+    custom_counter = test_metrics.get_custom_metric('test_custom_counter')
 
     # Increment the counter a few times
     for _ in range(5):
@@ -32,23 +26,12 @@ def test_basic_metrics_collection(test_metrics):
 @pytest.mark.metrics
 def test_metrics_with_timings(test_metrics):
     """Test metrics collection with timing measurements"""
-    # Create a custom histogram for timing
-    timing_histogram = test_metrics.create_custom_metric(
-        'test_operation_timing',
-        'Timing for test operations',
-        'histogram',
-        ['operation']
-    )
-
-    # Measure execution time for a simulated database operation
-    start = time.time()
-    time.sleep(0.05)  # Simulate database query
-    timing_histogram.labels(operation='db_query').observe(time.time() - start)
+    # Custom histogram for timing
+    timing_histogram = test_metrics.get_custom_metric('test_operation_timing')
 
-    # Measure execution time for a simulated API call
-    start = time.time()
-    time.sleep(0.1)  # Simulate API call
-    timing_histogram.labels(operation='api_call').observe(time.time() - start)
+    # Record timings for a simulated database query and API call
+    timing_histogram.labels(operation='db_query').observe(0.05)
+    timing_histogram.labels(operation='api_call').observe(0.1)
 
     # Record CPU usage
     test_metrics.record_resource_usage(
@@ -63,29 +46,21 @@ def test_metrics_with_timings(test_metrics):
 @pytest.mark.metrics
 def test_complex_metrics_scenario(test_metrics):
     """Test a more complex metrics collection scenario"""
-    # Create gauges to track simulated application metrics
-    active_connections = test_metrics.create_custom_metric(
-        'test_active_connections',
-        'Active connections in the test',
-        'gauge',
-        ['endpoint']
-    )
+    # Gauge to track simulated application metrics
+    active_connections = test_metrics.get_custom_metric('test_active_connections')
 
     # Simulate connection activity
     for endpoint in ['api', 'web', 'admin']:
         connections = random.randint(5, 50)
-        active_connections.labels(endpoint=endpoint).set(connections)
+        endpoint_gauge = active_connections.labels(endpoint=endpoint)
+        endpoint_gauge.set(connections)
 
-        # Simulate some work with these connections
-        time.sleep(0.01 * connections)
+        # Exercise the collection path with a burst of updates
+        for _ in range(connections):
+            endpoint_gauge.set(random.randint(0, 100))
 
-    # Create a success rate metric
-    success_rate = test_metrics.create_custom_metric(
-        'test_success_rate',
-        'Success rate for operations',
-        'gauge',
-        ['operation']
-    )
+    # Success rate metric
+    success_rate = test_metrics.get_custom_metric('test_success_rate')
 
     # Simulate operation success rates
     operations = {
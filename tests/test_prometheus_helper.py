@@ -0,0 +1,71 @@
+import pytest
+
+from tests.utils import prometheus_helper
+
+
+def _result(*values):
+    """Build an instant query result with one series per value"""
+    return {
+        "status": "success",
+        "data": {
+            "resultType": "vector",
+            "result": [
+                {"metric": {"i": str(i)}, "value": [0, str(v)]}
+                for i, v in enumerate(values)
+            ],
+        },
+    }
+
+
+@pytest.fixture(params=["numpy", "array"])
+def values_backend(request, monkeypatch):
+    """Run each test with NumPy-backed values and with the array("d") fallback"""
+    if request.param == "numpy":
+        try:
+            import numpy as np
+        except ImportError:
+            pytest.skip("numpy is not installed")
+        monkeypatch.setattr(prometheus_helper, "np", np)
+    else:
+        monkeypatch.setattr(prometheus_helper, "np", None)
+    return request.param
+
+
+def test_extract_values(values_backend):
+    """Values come back in order as floats"""
+    values = prometheus_helper.extract_values(_result(1, 2.5, "3"))
+    assert list(values) == [1.0, 2.5, 3.0]
+    assert all(type(float(v)) is float for v in values)
+
+
+def test_extract_values_empty(values_backend):
+    """Failed and empty results give an empty sequence"""
+    assert len(prometheus_helper.extract_values({"status": "error"})) == 0
+    assert len(prometheus_helper.extract_values(_result())) == 0
+
+
+@pytest.mark.parametrize(
+    "operator,threshold,expected",
+    [
+        (">", 1, True),
+        ("<", 1, False),
+        ("==", 2, True),
+        ("!=", 2, False),
+    ],
+)
+def test_result_meets_threshold_returns_bool(
+    values_backend, operator, threshold, expected
+):
+    """The check returns a plain bool whichever backend parsed the values"""
+    met = prometheus_helper.result_meets_threshold(_result(2), operator, threshold)
+    assert type(met) is bool
+    assert met is expected
+
+
+def test_result_meets_threshold_no_data(values_backend):
+    """A failed or empty result, or an unknown operator, never meets the threshold"""
+    assert (
+        prometheus_helper.result_meets_threshold({"status": "error"}, ">", 0) is False
+    )
+    assert prometheus_helper.result_meets_threshold(_result(), ">", 0) is False
+    assert prometheus_helper.result_meets_threshold(_result(2), "=~", 0) is False
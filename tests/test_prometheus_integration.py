@@ -11,10 +11,8 @@ def test_prometheus_connection(host):
     assert len(result["data"]["result"]) > 0, "No 'up' metrics found"
 
 @pytest.mark.prometheus
-def test_kubernetes_metrics_exist(host):
+def test_kubernetes_metrics_exist(prom):
     """Test that basic Kubernetes metrics exist"""
-    prom = host.prometheus
-
     # Check for some common Kubernetes metrics
     k8s_metrics = [
         "kube_node_status_condition",
@@ -23,8 +21,10 @@ def test_kubernetes_metrics_exist(host):
         "container_cpu_usage_seconds_total"
     ]
 
+    # Fetch all metric names once instead of querying each metric separately
+    names = prom.metric_names_set()
     for metric in k8s_metrics:
-        assert prom.check_metric_exists(metric), f"Metric {metric} not found in Prometheus"
+        assert metric in names, f"Metric {metric} not found in Prometheus"
 
 @pytest.mark.prometheus
 def test_node_resource_usage(host, prometheus_test_metrics):
@@ -59,42 +59,39 @@ def test_node_resource_usage(host, prometheus_test_metrics):
             "CPU usage exceeds available vCPUs"
 
 @pytest.mark.prometheus
-def test_pulumi_deployment_metrics(host):
+def test_pulumi_deployment_metrics(prom):
     """Test metrics for Pulumi deployments"""
-    prom = host.prometheus
-
     # Test project names
     projects = ["cluster-setup", "core-services", "storage"]
 
+    # One bulk fetch for all projects up front
+    snapshot = prom.bulk_pulumi_snapshot(projects)
+
     for project in projects:
-        # Check if we have any success metrics for the project
-        # Skip assertion if no metrics exist (project may not have been deployed during test)
-        has_success = prom.has_pulumi_success(project)
-        if has_success:
+        # Skip assertion if no success metrics exist (project may not have been deployed during test)
+        project_metrics = snapshot.get(project, {})
+        if "success" in project_metrics:
             # Check the most recent deployment success
-            success_query = f'pulumi_deployment_success{{project="{project}"}} == 1'
-            assert prom.check_value(success_query, '==', 1), f"Latest Pulumi deployment for {project} was not successful"
+            assert project_metrics["success"] == 1, f"Latest Pulumi deployment for {project} was not successful"
 
             # Check deployment duration is reasonable
-            duration_query = f'pulumi_deployment_duration_seconds{{project="{project}"}}'
-            duration_result = prom.query(duration_query)
-            if duration_result.get("status") == "success" and duration_result.get("data", {}).get("result"):
-                duration = float(duration_result["data"]["result"][0]["value"][1])
+            duration = project_metrics.get("duration")
+            if duration is not None:
                 assert duration > 0, f"Deployment duration for {project} should be greater than 0"
                 # Typically, Pulumi deployments shouldn't take more than an hour
                 assert duration < 3600, f"Deployment duration for {project} is suspiciously long ({duration} seconds)"
 
 @pytest.mark.prometheus
-def test_pulumi_resources_created(host):
+def test_pulumi_resources_created(prom):
     """Test that Pulumi resources were created successfully"""
-    prom = host.prometheus
-
     # Check core services resources
     namespaces = ["monitoring", "traefik", "cert-manager", "openebs"]
 
+    # One query for all namespaces, bucketed by namespace label
+    query = f'kube_namespace_created{{namespace=~"{"|".join(namespaces)}"}}'
+    created = prom.query_by_label(query, "namespace")
+
     for namespace in namespaces:
-        # Query that checks if namespace exists
-        query = f'kube_namespace_created{{namespace="{namespace}"}} == 1'
         # Skip assertion if namespace doesn't exist (might not be part of test)
-        if prom.check_metric_exists(f'kube_namespace_created{{namespace="{namespace}"}}'):
-            assert prom.check_value(query, '==', 1), f"Namespace {namespace} not found"
+        if namespace in created:
+            assert created[namespace].get("kube_namespace_created") == 1, f"Namespace {namespace} not found"
@@ -0,0 +1,52 @@
+import threading
+from typing import Optional
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Get the HTTP session shared by the test helpers (Loki, Prometheus, ...).
+
+    Created on first use; every helper that doesn't get a session injected
+    uses this one, so connections to each endpoint are pooled and kept alive
+    across the whole test run.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=50,
+                max_retries=Retry(
+                    total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504)
+                ),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _shared_session = session
+        return _shared_session
+
+
+def close_shared_session() -> None:
+    """Close the shared HTTP session; a new one is created on next use"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Pytest fixture providing the shared HTTP session, closed at the end of the run"""
+    session = get_shared_session()
+    yield session
+    close_shared_session()
@@ -1,12 +1,39 @@
 import os
 import socket
+import sys
 import datetime
+import time
+import gzip
+import json
 import logging
+import logging.handlers
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
 from loguru import logger
 from logging_loki import LokiHandler
+from logging_loki.emitter import LokiEmitterV1
 import pytest
+import requests
+
+from tests.utils.http_helper import get_shared_session
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        """Serialize obj to JSON bytes (orjson)"""
+        return orjson.dumps(obj)
+
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+
+    def _dumps(obj) -> bytes:
+        """Serialize obj to JSON bytes (stdlib json)"""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# (connect, read) timeouts for every request to Loki
+_REQUEST_TIMEOUT = (3.05, 10)
 
 # Configure default logger
 logging.basicConfig(
@@ -15,52 +42,126 @@ logging.basicConfig(
 )
 
 
+class _CompressedLokiEmitter(LokiEmitterV1):
+    """Loki v1 emitter that pushes orjson-encoded, gzip-compressed payloads"""
+
+    _headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+    def __call__(self, record: logging.LogRecord, line: str):
+        payload = gzip.compress(_dumps(self.build_payload(record, line)), compresslevel=1)
+        resp = self.session.post(
+            self.url, data=payload, headers=self._headers, timeout=_REQUEST_TIMEOUT
+        )
+        if resp.status_code != self.success_response_code:
+            raise ValueError(f"Unexpected Loki API response status code: {resp.status_code}")
+
+    def build_tags(self, record: logging.LogRecord) -> Dict[str, Any]:
+        tags = super().build_tags(record)
+        # loguru hands its extra dict to stdlib handlers as `record.extra`
+        # rather than as attributes, so pick up its "tags" from there too
+        extra = getattr(record, "extra", None)
+        extra_tags = extra.get("tags") if isinstance(extra, dict) else None
+        if isinstance(extra_tags, dict):
+            for tag_name, tag_value in extra_tags.items():
+                cleared_name = self.format_label(tag_name)
+                if cleared_name:
+                    tags[cleared_name] = tag_value
+        return tags
+
+
+class _CompressedLokiHandler(LokiHandler):
+    emitters = {**LokiHandler.emitters, "1": _CompressedLokiEmitter}
+
+
 class TestLogManager:
     """
     Manages logging for test suites with Loki integration.
     This allows centralized log aggregation and analysis of test runs.
     """
 
-    def __init__(self, loki_url: Optional[str] = None, test_run_id: Optional[str] = None):
+    def __init__(
+        self,
+        loki_url: Optional[str] = None,
+        test_run_id: Optional[str] = None,
+        max_query_minutes: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+    ):
         self.loki_url = loki_url or os.environ.get("LOKI_URL", "http://localhost:3100/loki/api/v1/push")
         self.test_run_id = test_run_id or os.environ.get(
             "TEST_RUN_ID", datetime.datetime.now().strftime("%Y%m%d%H%M%S")
         )
         self.hostname = socket.gethostname()
+        # Upper bound on the time range a single log query may scan
+        self.max_query_minutes = max_query_minutes or int(
+            os.environ.get("LOKI_MAX_QUERY_MINUTES", "60")
+        )
+        # Static parts of every log query, built once rather than per call
+        self._selector_prefix = f'{{test_run_id="{self.test_run_id}"'
+        self._query_url = self.loki_url.replace("/push", "/query_range")
+        # Loki queries reuse pooled keep-alive connections from the shared session
+        self._session = session or get_shared_session()
+        # Labels for the current test's log streams (see add_test_metadata)
+        self._test_tags: Dict[str, str] = {}
+        self._loki_handler: Optional[logging.handlers.QueueHandler] = None
+        self._loki_listener: Optional[logging.handlers.QueueListener] = None
         self._configure_logging()
+        # Probe Loki in the background so session start-up doesn't wait on it
+        self._probe_executor = ThreadPoolExecutor(max_workers=1)
+        self._loki_ready = self._probe_executor.submit(self._probe_loki)
 
     def _configure_logging(self) -> None:
-        # Check if we can connect to Loki
-        if self._check_loki_connection():
-            # Create a handler for python's logging
-            loki_handler = LokiHandler(
+        """Install the Loki handlers optimistically, before Loki is known to be up"""
+        # Records are queued and pushed to Loki from a background listener
+        # thread, so logging calls don't block tests on an HTTP round-trip.
+        # Until the probe succeeds the listener isn't running and records
+        # just accumulate in the queue.
+        log_queue = queue.Queue(-1)
+        loki_handler = logging.handlers.QueueHandler(log_queue)
+        self._loki_handler = loki_handler
+        self._loki_listener = logging.handlers.QueueListener(
+            log_queue,
+            _CompressedLokiHandler(
                 url=self.loki_url,
                 tags={"host": self.hostname, "test_run_id": self.test_run_id},
                 version="1",
-            )
+            ),
+        )
 
-            # Add handler to root logger
-            root_logger = logging.getLogger()
-            root_logger.addHandler(loki_handler)
+        # Add handler to root logger
+        root_logger = logging.getLogger()
+        root_logger.addHandler(loki_handler)
 
-            # Configure loguru logger to also send to Loki
-            logger.configure(
-                handlers=[
-                    {"sink": loki_handler, "format": "{time} - {name} - {level} - {message}"}
-                ]
-            )
+        # Configure loguru logger to also send to Loki
+        logger.configure(
+            handlers=[
+                {"sink": loki_handler, "format": "{time} - {name} - {level} - {message}"}
+            ]
+        )
 
+    def _probe_loki(self) -> bool:
+        """Check Loki and either start pushing queued records or fall back to the console"""
+        if self._check_loki_connection():
+            self._loki_listener.start()
             logger.info(f"Loki logging configured for test run {self.test_run_id}")
-        else:
-            logger.warning("Loki connection failed, falling back to console logging only")
+            return True
+
+        self._remove_loki_handler()
+        self._loki_listener = None
+        logger.warning("Loki connection failed, falling back to console logging only")
+        return False
+
+    def _remove_loki_handler(self) -> None:
+        logging.getLogger().removeHandler(self._loki_handler)
+        logger.remove()
+        logger.add(sys.stderr)
+        self._loki_handler = None
 
     def _check_loki_connection(self) -> bool:
         """Check if we can connect to the Loki server"""
         try:
-            import requests
-            response = requests.get(
+            response = self._session.get(
                 self.loki_url.replace("/push", ""),
-                timeout=2
+                timeout=_REQUEST_TIMEOUT
             )
             return response.status_code < 400
         except Exception as e:
@@ -68,30 +169,60 @@ class TestLogManager:
             return False
 
     def add_test_metadata(self, metadata: Dict[str, Any]) -> None:
-        """Add additional metadata to logs for the current test run"""
-        logger.bind(**metadata)
+        """
+        Add additional metadata to logs for the current test.
 
-    def get_logs_for_test(self, test_name: str, minutes: int = 30) -> Dict[str, Any]:
-        """Query Loki for logs related to a specific test"""
-        try:
-            import requests
-            end_time = datetime.datetime.now()
-            start_time = end_time - datetime.timedelta(minutes=minutes)
+        The metadata is attached to every following loguru record as its
+        `tags` extra, which the Loki handler sends as stream labels, so logs
+        can be queried back by e.g. `test="<name>"`.
+        """
+        self._test_tags.update((key, str(value)) for key, value in metadata.items())
+        logger.configure(extra={"tags": dict(self._test_tags)})
+
+    def clear_test_metadata(self) -> None:
+        """Drop the metadata added for the current test"""
+        self._test_tags.clear()
+        logger.configure(extra={})
 
-            # Convert to nanoseconds since unix epoch
-            start_ts = int(start_time.timestamp() * 1_000_000_000)
-            end_ts = int(end_time.timestamp() * 1_000_000_000)
+    def get_logs_for_test(
+        self, test_name: str, minutes: int = 5, contains: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Query Loki for logs related to a specific test.
+
+        If `contains` is given, a `|=` line filter is added so Loki drops
+        non-matching lines while scanning chunks, which is much cheaper than
+        returning every line of a busy stream and filtering client-side.
+
+        Results are returned newest-first, so Loki can stop once `limit` lines
+        are found instead of sorting the whole window. Windows longer than
+        `max_query_minutes` are rejected.
+        """
+        if minutes > self.max_query_minutes:
+            raise ValueError(
+                f"Query window of {minutes} minutes exceeds the "
+                f"{self.max_query_minutes} minute limit"
+            )
+        try:
+            # Nanoseconds since unix epoch, without float rounding
+            end_ns = time.time_ns()
+            start_ns = end_ns - minutes * 60 * 1_000_000_000
 
             # Query Loki
-            query_url = self.loki_url.replace("/push", "/query_range")
+            query = f'{self._selector_prefix}, test="{test_name}"}}'
+            if contains:
+                query += f" |= {json.dumps(contains)}"
             query_params = {
-                "query": f'{{test_run_id="{self.test_run_id}", test="{test_name}"}}',
-                "start": start_ts,
-                "end": end_ts,
+                "query": query,
+                "start": start_ns,
+                "end": end_ns,
                 "limit": 1000,
+                "direction": "backward",
             }
 
-            response = requests.get(query_url, params=query_params)
+            response = self._session.get(
+                self._query_url, params=query_params, timeout=_REQUEST_TIMEOUT
+            )
             if response.status_code == 200:
                 return response.json()
             else:
@@ -102,6 +233,43 @@ class TestLogManager:
             logger.exception(f"Error querying Loki: {str(e)}")
             return {"error": str(e)}
 
+    def wait_for_logs(
+        self, test_name: str, expected_count: int, timeout: float = 2.0
+    ) -> Dict[str, Any]:
+        """
+        Poll Loki until at least `expected_count` log lines exist for a test.
+
+        Returns as soon as the lines are visible (or a query error is reported),
+        backing off from 20ms up to 250ms between queries. On timeout the last
+        query result is returned so callers can decide how to handle it.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.02
+        while True:
+            logs = self.get_logs_for_test(test_name)
+            if "error" in logs:
+                return logs
+            streams = logs.get("data", {}).get("result", [])
+            if sum(len(stream.get("values", [])) for stream in streams) >= expected_count:
+                return logs
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return logs
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.25)
+
+    def close(self) -> None:
+        """Flush queued log records to Loki"""
+        # Let a still-running probe finish configuring (or removing) the handlers
+        self._loki_ready.result()
+        self._probe_executor.shutdown()
+        if self._loki_listener is not None:
+            # Stopping the listener drains whatever is still queued
+            self._loki_listener.stop()
+            self._loki_listener = None
+        if self._loki_handler is not None:
+            self._remove_loki_handler()
+
     def log_test_result(self, test_name: str, result: str, duration_ms: int) -> None:
         """Log test execution result with metrics"""
         logger.info(
@@ -115,10 +283,11 @@ class TestLogManager:
 
 # Create a pytest fixture for the log manager
 @pytest.fixture(scope="session")
-def test_log_manager():
+def test_log_manager(http_session):
     """Pytest fixture to provide a TestLogManager instance"""
-    log_manager = TestLogManager()
+    log_manager = TestLogManager(session=http_session)
     yield log_manager
+    log_manager.close()
 
 
 @pytest.fixture(scope="function")
@@ -128,15 +297,15 @@ def test_logger(request, test_log_manager):
     test_log_manager.add_test_metadata({"test": test_name})
 
     logger.info(f"Starting test: {test_name}")
-    start_time = datetime.datetime.now()
+    start_ns = time.perf_counter_ns()
 
     yield logger
 
     # Log test completion with duration
-    duration = datetime.datetime.now() - start_time
-    duration_ms = int(duration.total_seconds() * 1000)
+    duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
     result = "passed" if not request.node.rep_call.failed else "failed"
     test_log_manager.log_test_result(test_name, result, duration_ms)
+    test_log_manager.clear_test_metadata()
 
 
 # Pytest hook to capture test results
@@ -1,10 +1,49 @@
 import os
 import time
-import threading
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 import pytest
-from prometheus_client import Counter, Gauge, Histogram, Summary, start_http_server, REGISTRY
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram, Summary, start_http_server
+
+
+_METRIC_TYPES = {
+    "counter": Counter,
+    "gauge": Gauge,
+    "histogram": Histogram,
+    "summary": Summary,
+}
+
+
+# Collectors created by this module, by name, with the (type, labels) they
+# were created with, so a second manager in the same process reuses them
+# instead of tripping the registry's duplicate check
+_COLLECTORS: Dict[str, Tuple[Any, Tuple[type, Tuple[str, ...]]]] = {}
+
+
+def _get_or_create_metric(metric_cls, name: str, description: str, labels: List[str], **kwargs) -> Any:
+    """Create a metric, or return the one already created under this name"""
+    spec = (metric_cls, tuple(labels))
+    entry = _COLLECTORS.get(name)
+    if entry is None:
+        metric = metric_cls(name, description, labels, **kwargs)
+        _COLLECTORS[name] = (metric, spec)
+        return metric
+    metric, existing_spec = entry
+    if existing_spec != spec:
+        raise ValueError(f"Metric {name} already exists with a different type or labels")
+    return metric
+
+
+def _canonicalize_name(name: str) -> str:
+    """
+    Reduce a test name to a bounded label value.
+
+    Parametrize suffixes ("test_x[case-1]") are stripped and the result is
+    capped at 64 characters, so each test function maps to a single series
+    rather than one per parameter set. The full name goes to the logs instead.
+    """
+    return name.split("[", 1)[0][:64]
 
 
 class TestMetricsManager:
@@ -12,6 +51,15 @@ class TestMetricsManager:
     Manages test metrics collection and reporting to Prometheus.
     """
 
+    # Custom metrics used by the test suite, registered once up front:
+    # (name, description, type, labels)
+    _CUSTOM_SPECS = [
+        ("test_custom_counter", "A custom counter for testing", "counter", ["test_type"]),
+        ("test_operation_timing", "Timing for test operations", "histogram", ["operation"]),
+        ("test_active_connections", "Active connections in the test", "gauge", ["endpoint"]),
+        ("test_success_rate", "Success rate for operations", "gauge", ["operation"]),
+    ]
+
     def __init__(self, start_server: bool = False, port: int = 8000):
         """
         Initialize metrics manager.
@@ -21,66 +69,101 @@ class TestMetricsManager:
             port: Port to expose metrics on (if start_server is True)
         """
         self._metrics = {}
+        # Bound label children, keyed by (metric, *label values); saves the
+        # label lookup and tuple building on every observation
+        self._labeled_cache: Dict[tuple, Any] = {}
+        for name, description, metric_type, labels in self._CUSTOM_SPECS:
+            self.create_custom_metric(name, description, metric_type, labels)
 
         # Define standard metrics
-        self.test_total = Counter(
+        self.test_total = _get_or_create_metric(
+            Counter,
             'test_total',
             'Total number of tests run',
             ['test_name', 'test_file', 'role']
         )
-        self.test_success = Counter(
+        self.test_success = _get_or_create_metric(
+            Counter,
             'test_success',
             'Number of successful tests',
             ['test_name', 'test_file', 'role']
         )
-        self.test_failure = Counter(
+        self.test_failure = _get_or_create_metric(
+            Counter,
             'test_failure',
             'Number of failed tests',
             ['test_name', 'test_file', 'role']
         )
-        self.test_duration = Histogram(
+        self.test_duration = _get_or_create_metric(
+            Histogram,
             'test_duration_seconds',
             'Test execution duration in seconds',
-            ['test_name', 'test_file', 'role'],
+            # Per-test durations are logged to Loki; labelling the histogram
+            # by test would multiply its bucket series by the number of tests
+            ['role'],
             buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
         )
-        self.resource_usage = Gauge(
+        self.resource_usage = _get_or_create_metric(
+            Gauge,
             'test_resource_usage',
             'Resource usage during test',
-            ['test_name', 'resource_type']
+            ['resource_type']
         )
 
+        self._standard_metrics = {
+            'test_total': self.test_total,
+            'test_success': self.test_success,
+            'test_failure': self.test_failure,
+            'test_duration_seconds': self.test_duration,
+            'test_resource_usage': self.resource_usage,
+        }
+
         # Start metrics server if requested
-        self._server_thread = None
+        self._server = None
         if start_server:
             self._start_server(port)
 
     def _start_server(self, port: int) -> None:
-        """Start a metrics server in a background thread"""
-        def server_thread():
-            start_http_server(port)
-            while True:
-                time.sleep(1)
+        """Start a metrics server (served from prometheus_client's own daemon thread)"""
+        self._server, _ = start_http_server(port)
+
+    def close(self) -> None:
+        """Stop the metrics server, if one was started"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
 
-        self._server_thread = threading.Thread(target=server_thread, daemon=True)
-        self._server_thread.start()
+    def _labeled(self, metric: Any, *label_values: str) -> Any:
+        """Return the child of `metric` for the given label values (in declaration order)"""
+        key = (metric, *label_values)
+        child = self._labeled_cache.get(key)
+        if child is None:
+            child = metric.labels(*label_values)
+            self._labeled_cache[key] = child
+        return child
 
     def record_test_start(self, test_name: str, test_file: str, role: str = "unknown") -> None:
         """Record the start of a test"""
-        self.test_total.labels(test_name=test_name, test_file=test_file, role=role).inc()
+        short_name = _canonicalize_name(test_name)
+        self._labeled(self.test_total, short_name, test_file, role).inc()
 
     def record_test_result(self, test_name: str, test_file: str, role: str, success: bool, duration: float) -> None:
         """Record the result of a test"""
+        short_name = _canonicalize_name(test_name)
         if success:
-            self.test_success.labels(test_name=test_name, test_file=test_file, role=role).inc()
+            self._labeled(self.test_success, short_name, test_file, role).inc()
         else:
-            self.test_failure.labels(test_name=test_name, test_file=test_file, role=role).inc()
+            self._labeled(self.test_failure, short_name, test_file, role).inc()
 
-        self.test_duration.labels(test_name=test_name, test_file=test_file, role=role).observe(duration)
+        self._labeled(self.test_duration, role).observe(duration)
+        # Per-test detail belongs in the logs, not in Prometheus labels
+        logger.info("test detail", test_full=test_name, test_file=test_file, success=success, duration=duration)
 
     def record_resource_usage(self, test_name: str, resource_type: str, value: float) -> None:
         """Record resource usage during a test"""
-        self.resource_usage.labels(test_name=test_name, resource_type=resource_type).set(value)
+        self._labeled(self.resource_usage, resource_type).set(value)
+        logger.info("test resource usage", test_full=test_name, resource_type=resource_type, value=value)
 
     def create_custom_metric(self, name: str, description: str, metric_type: str = "counter",
                             labels: List[str] = None) -> Any:
@@ -89,28 +172,43 @@ class TestMetricsManager:
         if name in self._metrics:
             return self._metrics[name]
 
-        if metric_type.lower() == "counter":
-            self._metrics[name] = Counter(name, description, labels)
-        elif metric_type.lower() == "gauge":
-            self._metrics[name] = Gauge(name, description, labels)
-        elif metric_type.lower() == "histogram":
-            self._metrics[name] = Histogram(name, description, labels)
-        elif metric_type.lower() == "summary":
-            self._metrics[name] = Summary(name, description, labels)
-        else:
+        metric_cls = _METRIC_TYPES.get(metric_type.lower())
+        if metric_cls is None:
             raise ValueError(f"Unknown metric type: {metric_type}")
 
+        self._metrics[name] = _get_or_create_metric(metric_cls, name, description, labels)
+        return self._metrics[name]
+
+    def get_custom_metric(self, name: str) -> Any:
+        """Get a custom metric registered up front from _CUSTOM_SPECS"""
         return self._metrics[name]
 
-    def get_metric_value(self, name: str) -> Optional[float]:
-        """Get the current value of a metric"""
-        if name not in self._metrics:
+    def get_metric_value(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[float]:
+        """
+        Get the current value of a metric.
+
+        Samples are filtered by `labels` (if given) and summed over the label
+        sets that match. Reads the metric object directly instead of scanning
+        every collector in the global registry.
+
+        Returns None if the metric is unknown or no sample matched.
+        """
+        metric = self._metrics.get(name) or self._standard_metrics.get(name)
+        if metric is None:
             return None
 
+        sample_names = (name, name + '_total')
+        wanted = (labels or {}).items()
         try:
-            return REGISTRY.get_sample_value(name)
+            values = [
+                sample.value
+                for family in metric.collect()
+                for sample in family.samples
+                if sample.name in sample_names and wanted <= sample.labels.items()
+            ]
         except Exception:
             return None
+        return sum(values) if values else None
 
 
 # Create a pytest fixture for the metrics manager
@@ -123,6 +221,7 @@ def metrics_manager():
 
     manager = TestMetricsManager(start_server=start_server, port=port)
     yield manager
+    manager.close()
 
 
 @pytest.fixture(scope="function")
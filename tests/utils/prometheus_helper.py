@@ -1,47 +1,289 @@
+import functools
+import operator as _operator
 import os
+import re
 import time
-from typing import Dict, Any, List, Optional, Union
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import PurePath
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Union
 import logging
 
 import pytest
 import requests
 from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, Summary, push_to_gateway
 
+from tests.utils.http_helper import get_shared_session
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to array("d")
+    np = None
+
+try:
+    import diskcache
+except ImportError:  # diskcache is optional; the query cache then stays in memory
+    diskcache = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; range responses are then parsed whole
+    ijson = None
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    from json import loads as _loads
+
 logger = logging.getLogger(__name__)
 
+# Comparison operators accepted by the threshold checks
+_OPS = {
+    '>': _operator.gt,
+    '<': _operator.lt,
+    '>=': _operator.ge,
+    '<=': _operator.le,
+    '==': _operator.eq,
+    '!=': _operator.ne,
+}
+
+# Label added to each sub-query of a union query to tell its series apart
+_UNION_LABEL = "query_key"
+
+# (connect, read) timeouts for Prometheus API requests
+_REQUEST_TIMEOUT = (3.05, 10)
+
+# Sent with every Prometheus API request; set per request rather than on the
+# session, which is shared with the other helpers (requests already asks for
+# gzip/deflate responses by default)
+_REQUEST_HEADERS = {"Accept": "application/json"}
+
+# Metrics are pushed once at the end of the session, plus every this many
+# recorded tests so a crashed run still leaves most of them behind (0 disables)
+_PUSH_EVERY = int(os.environ.get("PROM_PUSH_EVERY", "100"))
+
+# Where the prometheus_helper fixture leaves its helper for pytest_sessionfinish
+_HELPER_KEY = pytest.StashKey["PrometheusTestHelper"]()
+
+# PromQL templates for get_k8s_resource_metrics, filled in with format_map
+_K8S_RESOURCE_TEMPLATES = {
+    "cpu": 'sum(rate(container_cpu_usage_seconds_total{{namespace="{ns}",pod=~"{name}.*"}}[5m]))',
+    "memory": 'sum(container_memory_usage_bytes{{namespace="{ns}",pod=~"{name}.*"}})',
+    "restarts": 'sum(kube_pod_container_status_restarts_total{{namespace="{ns}",pod=~"{name}.*"}})',
+}
+_K8S_REPLICA_TEMPLATES = {
+    "available_replicas": 'kube_{kind}_status_replicas_available{{namespace="{ns}",name="{name}"}}',
+    "desired_replicas": 'kube_{kind}_spec_replicas{{namespace="{ns}",name="{name}"}}',
+}
+
+_STEP_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_STEP_RE = re.compile(r"^(\d+(?:\.\d+)?)([smhdw]?)$")
+
+
+def _step_seconds(step: str) -> Optional[float]:
+    """Convert a simple Prometheus step ("15s", "1m", "30") to seconds; None if unsupported"""
+    match = _STEP_RE.match(str(step))
+    if not match:
+        return None
+    return float(match.group(1)) * _STEP_UNITS.get(match.group(2) or "s")
+
+
+def extract_values(result: Dict[str, Any]) -> Sequence[float]:
+    """
+    Get the sample values of all series in an instant query result
+
+    The values are parsed in one pass into a float64 array (a NumPy array if
+    NumPy is installed), so callers can aggregate over many series natively.
+
+    Args:
+        result: Query result dict from the Prometheus API
+
+    Returns:
+        Array of values, empty if the query failed or returned no series
+
+    Raises:
+        KeyError, IndexError, ValueError: If a series is malformed
+    """
+    data = result.get("data") if result.get("status") == "success" else None
+    series = data.get("result") if isinstance(data, dict) else None
+    if not series:
+        return np.empty(0) if np is not None else array("d")
+    values = (float(item["value"][1]) for item in series)
+    if np is not None:
+        return np.fromiter(values, dtype=np.float64, count=len(series))
+    return array("d", values)
+
+
+def _error_summary(response: requests.Response) -> str:
+    """Describe a failed response by status and the start of its body, without decoding all of it"""
+    head = next(response.iter_content(256), b"")
+    return f"HTTP {response.status_code} {response.reason} - {head!r}"
+
+
+def _series_key(metric: Dict[str, str]) -> str:
+    """Render a series' labels as a selector string, e.g. 'up{instance="a",job="b"}'"""
+    labels = ",".join(f'{k}="{v}"' for k, v in sorted(metric.items()) if k != "__name__")
+    return f'{metric.get("__name__", "")}{{{labels}}}'
+
+
+def _samples_to_arrays(samples: List[List[Any]]) -> tuple:
+    """Split [timestamp, "value"] pairs into (timestamps, values) arrays"""
+    count = len(samples)
+    if np is not None:
+        timestamps = np.fromiter((pair[0] for pair in samples), dtype=np.float64, count=count)
+        values = np.fromiter((float(pair[1]) for pair in samples), dtype=np.float64, count=count)
+    else:
+        timestamps = array("d", (pair[0] for pair in samples))
+        values = array("d", (float(pair[1]) for pair in samples))
+    return timestamps, values
+
+
+def result_meets_threshold(result: Dict[str, Any], operator: str, threshold: Union[int, float]) -> bool:
+    """
+    Check if the first value of a Prometheus query result meets a threshold condition
+
+    Args:
+        result: Query result dict from the Prometheus API
+        operator: Comparison operator ('>', '<', '>=', '<=', '==', '!=')
+        threshold: Threshold value to compare against
+
+    Returns:
+        Boolean indicating if the condition is met
+    """
+    try:
+        # Extract the value from the result
+        values = extract_values(result)
+        if not len(values):
+            return False
+        # Plain float, so the comparison yields a bool rather than numpy.bool_
+        value = float(values[0])
+
+        # Compare using the specified operator
+        op = _OPS.get(operator)
+        if op is None:
+            logger.error(f"Unknown operator: {operator}")
+            return False
+        return bool(op(value, threshold))
+    except (KeyError, IndexError, ValueError) as e:
+        logger.error(f"Error processing metric value: {str(e)}")
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _component_for_dir(dirname: str) -> Optional[str]:
+    """
+    Get the component a test directory belongs to, or None if it can't be told
+
+    That is the directory right below "pulumi", or right below "roles" for
+    Ansible role tests. Every test in a directory maps to the same component,
+    so the result is cached per directory.
+    """
+    parts = PurePath(dirname).parts
+    is_ansible = "ansible" in parts
+    role = None
+    prev = None
+    for part in parts:
+        if prev == "pulumi":
+            return part
+        if prev == "roles" and is_ansible and role is None:
+            role = part
+        prev = part
+    return role
+
+
 class PrometheusTestHelper:
     """
     Helper class for working with Prometheus metrics in tests.
     This allows for both generating test metrics and querying Prometheus for validation.
     """
 
-    def __init__(self, prometheus_url: Optional[str] = None, pushgateway_url: Optional[str] = None):
+    # Upper bound on cached query results; least recently used are evicted first
+    _CACHE_MAX_ENTRIES = 512
+    # Circuit breaker: after this many consecutive failed requests, Prometheus
+    # isn't called again for _OPEN_SECONDS
+    _FAILURE_THRESHOLD = 5
+    _OPEN_SECONDS = 30.0
+
+    def __init__(self, prometheus_url: Optional[str] = None, pushgateway_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         self.prometheus_url = prometheus_url or os.environ.get("PROMETHEUS_URL", "http://localhost:9090")
         self.pushgateway_url = pushgateway_url or os.environ.get("PUSHGATEWAY_URL", "http://localhost:9091")
         self.registry = CollectorRegistry()
         self.test_run_id = os.environ.get("TEST_RUN_ID", f"test-{int(time.time())}")
         self.job_name = os.environ.get("TEST_JOB_NAME", "molecule-tests")
-
-        # Initialize common metrics
-        self.test_duration = Histogram(
+        self._session = session or get_shared_session()
+        # Worker threads for issuing independent queries concurrently; they
+        # share the pooled session, so each query reuses a kept-alive connection
+        self._query_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="prom-query")
+        # A single worker keeps Pushgateway pushes off the caller's thread, in order
+        self._push_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prom-push")
+        # Successful query results, reused for PROM_CACHE_TTL seconds (0 disables)
+        self._cache_ttl = float(os.environ.get("PROM_CACHE_TTL", "30"))
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # With PROM_CACHE_DIR set (and diskcache installed) the cache lives on
+        # disk instead, shared by every pytest-xdist worker using that directory;
+        # bump PROM_CACHE_VERSION to ignore what earlier runs cached there
+        self._disk_cache = None
+        self._cache_version = os.environ.get("PROM_CACHE_VERSION", "1")
+        cache_dir = os.environ.get("PROM_CACHE_DIR")
+        if cache_dir and self._cache_ttl > 0:
+            if diskcache is not None:
+                self._disk_cache = diskcache.Cache(cache_dir)
+            else:
+                logger.warning("PROM_CACHE_DIR is set but diskcache isn't installed; caching in memory")
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._breaker_lock = threading.Lock()
+
+        # Labelled metric children, so repeated records skip the label lookup:
+        # (duration, success, failure) keyed by (test_name, test_file, component)
+        self._result_children: Dict[tuple, tuple] = {}
+        # resource_usage children keyed by (test_name, resource_type, component)
+        self._resource_children: Dict[tuple, Gauge] = {}
+        self._results_recorded = 0
+        # Set when something is recorded, cleared once it has been pushed
+        self._dirty = False
+
+    # Common metrics are created on first use, so helpers that only query
+    # Prometheus never build or register them
+
+    @functools.cached_property
+    def test_duration(self) -> Histogram:
+        """Histogram of test execution durations"""
+        return Histogram(
             'test_duration_seconds',
             'Test execution duration in seconds',
             ['test_name', 'test_file', 'component'],
             registry=self.registry
         )
-        self.test_success = Counter(
+
+    @functools.cached_property
+    def test_success(self) -> Counter:
+        """Counter of successful tests"""
+        return Counter(
             'test_success_total',
             'Number of successful tests',
             ['test_name', 'test_file', 'component'],
             registry=self.registry
         )
-        self.test_failure = Counter(
+
+    @functools.cached_property
+    def test_failure(self) -> Counter:
+        """Counter of failed tests"""
+        return Counter(
             'test_failure_total',
             'Number of failed tests',
             ['test_name', 'test_file', 'component'],
             registry=self.registry
         )
-        self.resource_usage = Gauge(
+
+    @functools.cached_property
+    def resource_usage(self) -> Gauge:
+        """Gauge of resource usage recorded during tests"""
+        return Gauge(
             'test_resource_usage',
             'Resource usage during test',
             ['test_name', 'resource_type', 'component'],
@@ -51,45 +293,66 @@ class PrometheusTestHelper:
     def record_test_result(self, test_name: str, success: bool, duration: float,
                            test_file: str = "unknown", component: str = "unknown") -> None:
         """Record test result as Prometheus metrics"""
-        labels = {"test_name": test_name, "test_file": test_file, "component": component}
-
-        self.test_duration.labels(
-            test_name=test_name,
-            test_file=test_file,
-            component=component
-        ).observe(duration)
+        self._results_recorded += 1
+        key = (test_name, test_file, component)
+        children = self._result_children.get(key)
+        if children is None:
+            children = (
+                self.test_duration.labels(*key),
+                self.test_success.labels(*key),
+                self.test_failure.labels(*key)
+            )
+            self._result_children[key] = children
 
+        duration_child, success_child, failure_child = children
+        duration_child.observe(duration)
         if success:
-            self.test_success.labels(
-                test_name=test_name,
-                test_file=test_file,
-                component=component
-            ).inc()
+            success_child.inc()
         else:
-            self.test_failure.labels(
-                test_name=test_name,
-                test_file=test_file,
-                component=component
-            ).inc()
+            failure_child.inc()
+        self._dirty = True
 
     def record_resource_usage(self, test_name: str, resource_type: str, value: float,
                               component: str = "unknown") -> None:
         """Record resource usage during test"""
-        self.resource_usage.labels(
-            test_name=test_name,
-            resource_type=resource_type,
-            component=component
-        ).set(value)
-
-    def push_metrics(self, grouping_key: Optional[Dict[str, str]] = None) -> bool:
-        """Push metrics to Pushgateway"""
-        try:
-            if not grouping_key:
-                grouping_key = {
-                    "test_run_id": self.test_run_id,
-                    "instance": os.environ.get("HOSTNAME", "localhost")
-                }
+        key = (test_name, resource_type, component)
+        child = self._resource_children.get(key)
+        if child is None:
+            child = self.resource_usage.labels(
+                test_name=test_name,
+                resource_type=resource_type,
+                component=component
+            )
+            self._resource_children[key] = child
+        child.set(value)
+        self._dirty = True
+
+    def push_metrics(self, grouping_key: Optional[Dict[str, str]] = None) -> "Future[bool]":
+        """
+        Push metrics to Pushgateway in the background
+
+        Skipped when nothing has been recorded since the last push.
+
+        Returns:
+            Future resolving to whether the push succeeded
+        """
+        if not self._dirty:
+            done: "Future[bool]" = Future()
+            done.set_result(True)
+            return done
+        if not grouping_key:
+            grouping_key = {
+                "test_run_id": self.test_run_id,
+                "instance": os.environ.get("HOSTNAME", "localhost")
+            }
+        return self._push_executor.submit(self._push, grouping_key)
 
+    def _push(self, grouping_key: Dict[str, str]) -> bool:
+        """Push the registry to Pushgateway (runs on the push worker)"""
+        # Cleared before the registry is read, so anything recorded meanwhile
+        # marks it dirty again for the next push
+        self._dirty = False
+        try:
             push_to_gateway(
                 self.pushgateway_url,
                 job=self.job_name,
@@ -99,12 +362,93 @@ class PrometheusTestHelper:
             return True
         except Exception as e:
             logger.error(f"Failed to push metrics to Pushgateway: {str(e)}")
+            self._dirty = True
             return False
 
+    def flush(self) -> None:
+        """Wait for pending pushes to finish; no pushes can be made afterwards"""
+        self._push_executor.shutdown(wait=True)
+
+    def close(self) -> None:
+        """Stop the query worker threads and close the disk cache (the HTTP session is owned by http_helper)"""
+        self._query_executor.shutdown(wait=True)
+        if self._disk_cache is not None:
+            # Expired entries are only dropped lazily on lookup; purge them so
+            # the cache directory doesn't keep growing from run to run
+            self._disk_cache.expire()
+            self._disk_cache.close()
+
+    def _cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a cached result that is still within the TTL, or None"""
+        if self._cache_ttl <= 0:
+            return None
+        if self._disk_cache is not None:
+            return self._disk_cache.get((self._cache_version, *key))
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.time() - stored_at >= self._cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: tuple, result: Dict[str, Any]) -> None:
+        """Cache a successful query result, evicting the least recently used past the size limit"""
+        if self._cache_ttl <= 0 or result.get("status") != "success":
+            return
+        if self._disk_cache is not None:
+            self._disk_cache.set((self._cache_version, *key), result, expire=self._cache_ttl)
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.time(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop all cached query results (for every worker, with the disk cache)"""
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _circuit_open(self) -> bool:
+        """Whether Prometheus requests are currently being skipped after repeated failures"""
+        return time.time() < self._open_until
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET a Prometheus API URL, tracking failures for the circuit breaker"""
+        kwargs.setdefault("timeout", _REQUEST_TIMEOUT)
+        kwargs.setdefault("headers", _REQUEST_HEADERS)
+        try:
+            response = self._session.get(url, **kwargs)
+        except Exception:
+            with self._breaker_lock:
+                self._consecutive_failures += 1
+                if self._consecutive_failures >= self._FAILURE_THRESHOLD and not self._circuit_open():
+                    logger.warning(
+                        f"Prometheus unreachable after {self._consecutive_failures} attempts, "
+                        f"skipping requests for {self._OPEN_SECONDS:.0f}s"
+                    )
+                    self._open_until = time.time() + self._OPEN_SECONDS
+            raise
+        if self._consecutive_failures:
+            with self._breaker_lock:
+                if self._consecutive_failures >= self._FAILURE_THRESHOLD:
+                    logger.info("Prometheus reachable again, resuming requests")
+                self._consecutive_failures = 0
+        return response
+
     def query_prometheus(self, query: str, time_window: str = "5m") -> Dict[str, Any]:
         """
         Query Prometheus using PromQL
 
+        Results are cached for PROM_CACHE_TTL seconds, so repeated queries
+        within a session are answered without another round-trip.
+
         Args:
             query: PromQL query string
             time_window: Time window for the query (e.g. "5m" for 5 minutes)
@@ -112,21 +456,83 @@ class PrometheusTestHelper:
         Returns:
             Dict containing query results
         """
+        now = time.time()
+        # Snap the evaluation time so identical queries in the same window share a key
+        snapped = int(now // self._cache_ttl) if self._cache_ttl > 0 else int(now)
+        key = ("query", query, snapped)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        if self._circuit_open():
+            return {"status": "error", "error": "circuit open", "data": None}
+
         try:
             params = {
                 "query": query,
-                "time": int(time.time())
+                "time": int(now)
             }
-            response = requests.get(f"{self.prometheus_url}/api/v1/query", params=params)
+            response = self._get(
+                f"{self.prometheus_url}/api/v1/query", params=params
+            )
             if response.status_code == 200:
-                return response.json()
+                result = _loads(response.content)
+                self._cache_put(key, result)
+                return result
             else:
-                logger.error(f"Failed to query Prometheus: {response.status_code} - {response.text}")
+                logger.error(f"Failed to query Prometheus: {_error_summary(response)}")
                 return {"status": "error", "error": f"HTTP {response.status_code}", "data": None}
         except Exception as e:
             logger.error(f"Error querying Prometheus: {str(e)}")
             return {"status": "error", "error": str(e), "data": None}
 
+    def query_many(self, queries: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run several independent PromQL queries concurrently
+
+        Args:
+            queries: Dict mapping a result key to a PromQL query string
+
+        Returns:
+            Dict mapping each key to its query result, as returned by query_prometheus
+        """
+        results = self._query_executor.map(self.query_prometheus, queries.values())
+        return dict(zip(queries, results))
+
+    def query_union(self, queries: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run several instant queries as a single `or`-unioned PromQL request
+
+        Each sub-query is tagged with a `query_key` label via label_replace, and
+        the combined result is split back per key. If the union query fails the
+        queries are run separately (concurrently) instead.
+
+        Args:
+            queries: Dict mapping a result key to a PromQL query string
+
+        Returns:
+            Dict mapping each key to a query result dict shaped like query_prometheus output
+        """
+        union = " or ".join(
+            f'label_replace({query}, "{_UNION_LABEL}", "{key}", "", "")'
+            for key, query in queries.items()
+        )
+        result = self.query_prometheus(union)
+        if result.get("status") != "success" or not isinstance(result.get("data"), dict):
+            logger.warning("Union query failed, falling back to separate queries")
+            return self.query_many(queries)
+
+        series_by_key: Dict[str, List[Dict[str, Any]]] = {key: [] for key in queries}
+        for item in result["data"].get("result", []):
+            labels = dict(item.get("metric", {}))
+            key = labels.pop(_UNION_LABEL, None)
+            if key in series_by_key:
+                series_by_key[key].append({**item, "metric": labels})
+
+        return {
+            key: {"status": "success", "data": {"resultType": "vector", "result": series}}
+            for key, series in series_by_key.items()
+        }
+
     def query_range(self, query: str, start_time: int, end_time: int, step: str = "15s") -> Dict[str, Any]:
         """
         Query Prometheus for a range of time
@@ -140,6 +546,18 @@ class PrometheusTestHelper:
         Returns:
             Dict containing query results
         """
+        # Align the range to the step so equivalent ranges share a cache entry
+        step_seconds = _step_seconds(step)
+        if step_seconds:
+            start_time = int(start_time // step_seconds * step_seconds)
+            end_time = int(end_time // step_seconds * step_seconds)
+        key = ("query_range", query, start_time, end_time, step)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        if self._circuit_open():
+            return {"status": "error", "error": "circuit open", "data": None}
+
         try:
             params = {
                 "query": query,
@@ -147,16 +565,138 @@ class PrometheusTestHelper:
                 "end": end_time,
                 "step": step
             }
-            response = requests.get(f"{self.prometheus_url}/api/v1/query_range", params=params)
+            response = self._get(
+                f"{self.prometheus_url}/api/v1/query_range", params=params
+            )
             if response.status_code == 200:
-                return response.json()
+                result = _loads(response.content)
+                self._cache_put(key, result)
+                return result
             else:
-                logger.error(f"Failed to query Prometheus range: {response.status_code} - {response.text}")
+                logger.error(f"Failed to query Prometheus range: {_error_summary(response)}")
                 return {"status": "error", "error": f"HTTP {response.status_code}", "data": None}
         except Exception as e:
             logger.error(f"Error querying Prometheus range: {str(e)}")
             return {"status": "error", "error": str(e), "data": None}
 
+    def query_range_np(self, query: str, start_time: int, end_time: int,
+                       step: str = "15s") -> Dict[str, tuple]:
+        """
+        Query Prometheus for a range of time and return each series as arrays
+
+        Meant for long ranges: the response is stream-parsed series by series
+        (with ijson, if installed) and the samples go straight into float64
+        arrays, instead of building the whole nested result first. The result
+        isn't cached; use query_range for the plain dict form.
+
+        Args:
+            query: PromQL query string
+            start_time: Start timestamp in seconds
+            end_time: End timestamp in seconds
+            step: Step interval (e.g. "15s", "1m")
+
+        Returns:
+            Dict mapping each series (as a selector string) to a
+            (timestamps, values) tuple of arrays; empty if the query fails
+        """
+        if self._circuit_open():
+            return {}
+
+        try:
+            params = {
+                "query": query,
+                "start": start_time,
+                "end": end_time,
+                "step": step
+            }
+            with self._get(
+                f"{self.prometheus_url}/api/v1/query_range", params=params,
+                stream=ijson is not None
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to query Prometheus range: {_error_summary(response)}")
+                    return {}
+                if ijson is not None:
+                    # Let urllib3 undo any gzip transfer encoding while streaming
+                    response.raw.decode_content = True
+                    series = ijson.items(response.raw, "data.result.item", use_float=True)
+                else:
+                    series = (_loads(response.content).get("data") or {}).get("result", [])
+                return {
+                    _series_key(item.get("metric", {})): _samples_to_arrays(item.get("values", []))
+                    for item in series
+                }
+        except Exception as e:
+            logger.error(f"Error querying Prometheus range: {str(e)}")
+            return {}
+
+    def label_values(self, label: str) -> Dict[str, Any]:
+        """
+        Get all values of a label known to Prometheus
+
+        Args:
+            label: Label name (e.g. "__name__" for all metric names)
+
+        Returns:
+            Dict containing the label values response
+        """
+        if self._circuit_open():
+            return {"status": "error", "error": "circuit open", "data": None}
+
+        try:
+            response = self._get(
+                f"{self.prometheus_url}/api/v1/label/{label}/values"
+            )
+            if response.status_code == 200:
+                return _loads(response.content)
+            else:
+                logger.error(f"Failed to query Prometheus label values: {_error_summary(response)}")
+                return {"status": "error", "error": f"HTTP {response.status_code}", "data": None}
+        except Exception as e:
+            logger.error(f"Error querying Prometheus label values: {str(e)}")
+            return {"status": "error", "error": str(e), "data": None}
+
+    def _series_exists(self, metric_name: str) -> bool:
+        """
+        Check if any series matching a selector was seen in the last 5 minutes
+
+        Uses the /api/v1/series endpoint, which only looks up the series index
+        instead of evaluating the selector like an instant query would.
+
+        Args:
+            metric_name: Metric name or series selector (e.g. 'up{job="node"}')
+
+        Returns:
+            Boolean indicating if a matching series exists
+        """
+        now = time.time()
+        snapped = int(now // self._cache_ttl) if self._cache_ttl > 0 else int(now)
+        key = ("series", metric_name, snapped)
+        result = self._cache_get(key)
+
+        if result is None:
+            if self._circuit_open():
+                return False
+            try:
+                params = {
+                    "match[]": metric_name,
+                    "start": int(now) - 300,
+                    "end": int(now)
+                }
+                response = self._get(
+                    f"{self.prometheus_url}/api/v1/series", params=params
+                )
+                if response.status_code != 200:
+                    logger.error(f"Failed to query Prometheus series: {_error_summary(response)}")
+                    return False
+                result = _loads(response.content)
+                self._cache_put(key, result)
+            except Exception as e:
+                logger.error(f"Error querying Prometheus series: {str(e)}")
+                return False
+
+        return result.get("status") == "success" and len(result.get("data") or []) > 0
+
     def check_metric_threshold(self, metric_query: str, operator: str, threshold: Union[int, float]) -> bool:
         """
         Check if a metric meets a threshold condition
@@ -169,33 +709,7 @@ class PrometheusTestHelper:
         Returns:
             Boolean indicating if the condition is met
         """
-        result = self.query_prometheus(metric_query)
-        if result.get("status") != "success" or not result.get("data", {}).get("result"):
-            return False
-
-        try:
-            # Extract the value from the result
-            value = float(result["data"]["result"][0]["value"][1])
-
-            # Compare using the specified operator
-            if operator == '>':
-                return value > threshold
-            elif operator == '<':
-                return value < threshold
-            elif operator == '>=':
-                return value >= threshold
-            elif operator == '<=':
-                return value <= threshold
-            elif operator == '==':
-                return value == threshold
-            elif operator == '!=':
-                return value != threshold
-            else:
-                logger.error(f"Unknown operator: {operator}")
-                return False
-        except (KeyError, IndexError, ValueError) as e:
-            logger.error(f"Error processing metric value: {str(e)}")
-            return False
+        return result_meets_threshold(self.query_prometheus(metric_query), operator, threshold)
 
     def get_k8s_resource_metrics(self, namespace: str, resource_type: str,
                                 resource_name: str) -> Dict[str, Any]:
@@ -210,38 +724,24 @@ class PrometheusTestHelper:
         Returns:
             Dict containing resource metrics
         """
-        metrics = {
-            "cpu": self.query_prometheus(
-                f'sum(rate(container_cpu_usage_seconds_total{{namespace="{namespace}",'
-                f'pod=~"{resource_name}.*"}}[5m]))'
-            ),
-            "memory": self.query_prometheus(
-                f'sum(container_memory_usage_bytes{{namespace="{namespace}",'
-                f'pod=~"{resource_name}.*"}})'
-            ),
-            "restarts": self.query_prometheus(
-                f'sum(kube_pod_container_status_restarts_total{{namespace="{namespace}",'
-                f'pod=~"{resource_name}.*"}})'
-            )
-        }
+        args = {"ns": namespace, "name": resource_name, "kind": resource_type}
+        queries = {key: tpl.format_map(args) for key, tpl in _K8S_RESOURCE_TEMPLATES.items()}
 
         if resource_type in ["deployment", "statefulset", "daemonset"]:
-            metrics["available_replicas"] = self.query_prometheus(
-                f'kube_{resource_type}_status_replicas_available{{namespace="{namespace}",'
-                f'name="{resource_name}"}}'
-            )
-            metrics["desired_replicas"] = self.query_prometheus(
-                f'kube_{resource_type}_spec_replicas{{namespace="{namespace}",'
-                f'name="{resource_name}"}}'
-            )
+            queries.update((key, tpl.format_map(args)) for key, tpl in _K8S_REPLICA_TEMPLATES.items())
 
-        return metrics
+        # Fetch everything in one round-trip rather than one per metric
+        return self.query_union(queries)
 
 
 @pytest.fixture(scope="session")
-def prometheus_helper():
+def prometheus_helper(request, http_session):
     """Return a PrometheusTestHelper instance for the test session"""
-    return PrometheusTestHelper()
+    helper = PrometheusTestHelper(session=http_session)
+    # Metrics are pushed once, by pytest_sessionfinish
+    request.config.stash[_HELPER_KEY] = helper
+    yield helper
+    helper.close()
 
 
 @pytest.fixture(scope="function")
@@ -250,18 +750,9 @@ def prometheus_test_metrics(request, prometheus_helper):
     # Setup
     test_name = request.node.name
     test_file = request.node.fspath.basename
-    component = os.environ.get("TEST_COMPONENT", "unknown")
-
     # Extract component from path if possible
-    path_parts = str(request.node.fspath).split('/')
-    if "pulumi" in path_parts:
-        idx = path_parts.index("pulumi")
-        if idx + 1 < len(path_parts):
-            component = path_parts[idx + 1]
-    elif "ansible" in path_parts and "roles" in path_parts:
-        idx = path_parts.index("roles")
-        if idx + 1 < len(path_parts):
-            component = path_parts[idx + 1]
+    component = (_component_for_dir(request.node.fspath.dirname)
+                 or os.environ.get("TEST_COMPONENT", "unknown"))
 
     start_time = time.time()
 
@@ -278,8 +769,9 @@ def prometheus_test_metrics(request, prometheus_helper):
         component=component
     )
 
-    # Push metrics at end of test
-    prometheus_helper.push_metrics()
+    # The registry accumulates across tests; push periodically in case the run dies
+    if _PUSH_EVERY and prometheus_helper._results_recorded % _PUSH_EVERY == 0:
+        prometheus_helper.push_metrics()
 
 
 # Add hook to ensure the fixtures work properly
@@ -288,3 +780,12 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     setattr(item, f"rep_{rep.when}", rep)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    """Push the metrics recorded during the session in one go"""
+    helper = session.config.stash.get(_HELPER_KEY, None)
+    if helper is not None:
+        helper.push_metrics()
+        helper.flush()
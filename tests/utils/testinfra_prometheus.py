@@ -1,76 +1,139 @@
+import atexit
 import os
 import time
 import re
+import functools
+import math
+import threading
+from typing import Optional
+
 import pytest
 import testinfra
 
-from tests.utils.prometheus_helper import PrometheusTestHelper
+from tests.utils.prometheus_helper import PrometheusTestHelper, extract_values
+
+# PromQL templates for the query builders below, filled in with format_map
+_TPL_PULUMI_SUCCESS = 'pulumi_deployment_success{{project="{project}"}}[{window}]'
+_TPL_DEPLOYMENT_READY = (
+    'kube_deployment_status_replicas_available{{namespace="{ns}",deployment="{name}"}} == '
+    'kube_deployment_status_replicas_desired{{namespace="{ns}",deployment="{name}"}}'
+)
+_TPL_POD_RESTARTS = 'sum(kube_pod_container_status_restarts_total{{namespace="{ns}",pod=~"{pattern}"}})'
+_TPL_NODE_RESOURCES = {
+    "cpu": 'sum(rate(node_cpu_seconds_total{{mode!="idle",instance=~"{node}.*"}}[5m]))',
+    "memory": (
+        'node_memory_MemTotal_bytes{{instance=~"{node}.*"}} - '
+        'node_memory_MemAvailable_bytes{{instance=~"{node}.*"}}'
+    ),
+    "disk": (
+        'node_filesystem_size_bytes{{instance=~"{node}.*",mountpoint="/"}} - '
+        'node_filesystem_free_bytes{{instance=~"{node}.*",mountpoint="/"}}'
+    ),
+}
+
+
+def _label_regex(values):
+    """
+    Build a PromQL regex label matcher value that matches exactly `values`
+
+    Each value is regex-escaped, then the backslashes and quotes are escaped
+    again for the double-quoted PromQL string literal.
+    """
+    pattern = "|".join(re.escape(value) for value in values)
+    return pattern.replace("\\", "\\\\").replace('"', '\\"')
+
+
+_SHARED_HELPER: Optional[PrometheusTestHelper] = None
+_SHARED_HELPER_LOCK = threading.Lock()
+
+
+def _get_helper() -> PrometheusTestHelper:
+    """
+    Get the PrometheusTestHelper shared by every PrometheusModule.
+
+    Testinfra builds a module per host, so sharing one helper lets all of
+    them reuse the same query cache and pooled connections.
+    """
+    global _SHARED_HELPER
+    with _SHARED_HELPER_LOCK:
+        if _SHARED_HELPER is None:
+            _SHARED_HELPER = PrometheusTestHelper()
+            # Outlives any one fixture, so release its executor and cache at exit
+            atexit.register(_SHARED_HELPER.close)
+        return _SHARED_HELPER
+
 
 class PrometheusModule:
-    """Testinfra module for Prometheus metric validation"""
+    """
+    Testinfra module for Prometheus metric validation
+
+    The plain query calls are bound straight to the shared helper's methods:
+
+        url: Prometheus server URL
+        query(query_string): Run a PromQL query, returning the API result dict
+        query_range(query_string, start_time, end_time, step="15s"):
+            Run a PromQL range query, returning the API result dict
+        check_value(query_string, operator, threshold):
+            Check if the query's value meets a threshold condition
+            ('>', '<', '>=', '<=', '==', '!=')
+    """
 
     def __init__(self, host):
         self.host = host
-        self._helper = PrometheusTestHelper()
-
-    @property
-    def url(self):
-        """Get the Prometheus server URL"""
-        return self._helper.prometheus_url
+        self._helper = _get_helper()
+        self.url = self._helper.prometheus_url
+        self.query = self._helper.query_prometheus
+        self.query_range = self._helper.query_range
+        self.check_value = self._helper.check_metric_threshold
 
-    def query(self, query_string):
+    def check_metric_exists(self, metric_name):
         """
-        Run a PromQL query against Prometheus
+        Check if a metric exists in Prometheus
 
         Args:
-            query_string: PromQL query expression
+            metric_name: Name of the metric (or a series selector) to check
 
         Returns:
-            Query result dict from Prometheus API
+            Boolean indicating if the metric exists
         """
-        return self._helper.query_prometheus(query_string)
+        return self._helper._series_exists(metric_name)
 
-    def query_range(self, query_string, start_time, end_time, step="15s"):
+    def metric_names_set(self):
         """
-        Run a PromQL range query against Prometheus
-
-        Args:
-            query_string: PromQL query expression
-            start_time: Start timestamp in seconds
-            end_time: End timestamp in seconds
-            step: Step interval (e.g., "15s", "1m")
+        Get the names of all metrics known to Prometheus in one request
 
         Returns:
-            Query result dict from Prometheus API for the time range
+            Frozenset of metric names (empty if the request fails)
         """
-        return self._helper.query_range(query_string, start_time, end_time, step)
+        result = self._helper.label_values("__name__")
+        if result.get("status") != "success":
+            return frozenset()
+        return frozenset(result.get("data") or [])
 
-    def check_metric_exists(self, metric_name):
+    def query_by_label(self, query_string, label):
         """
-        Check if a metric exists in Prometheus
+        Run a PromQL query and group the returned values by a label
 
         Args:
-            metric_name: Name of the metric to check
-
-        Returns:
-            Boolean indicating if the metric exists
-        """
-        result = self.query(f'{metric_name}')
-        return result.get("status") == "success" and len(result.get("data", {}).get("result", [])) > 0
-
-    def check_value(self, query_string, operator, threshold):
-        """
-        Check if a metric meets a threshold condition
-
-        Args:
-            query_string: PromQL query that returns a single value
-            operator: Comparison operator ('>', '<', '>=', '<=', '==', '!=')
-            threshold: Threshold value to compare against
+            query_string: PromQL query expression
+            label: Label to group the series by (e.g., "project")
 
         Returns:
-            Boolean indicating if the condition is met
+            Dict mapping each label value to a dict of metric name -> value.
+            If several series share a metric name, the first one wins.
         """
-        return self._helper.check_metric_threshold(query_string, operator, threshold)
+        grouped = {}
+        result = self.query(query_string)
+        if result.get("status") != "success":
+            return grouped
+        for item in result.get("data", {}).get("result", []):
+            metric = item.get("metric", {})
+            try:
+                value = float(item["value"][1])
+            except (KeyError, IndexError, ValueError):
+                continue
+            grouped.setdefault(metric.get(label), {}).setdefault(metric.get("__name__"), value)
+        return grouped
 
     def has_pulumi_success(self, project, time_window="1h"):
         """
@@ -83,10 +146,48 @@ class PrometheusModule:
         Returns:
             Boolean indicating if the deployment was successful
         """
-        query = f'pulumi_deployment_success{{project="{project}"}}[{time_window}]'
+        query = _TPL_PULUMI_SUCCESS.format_map({"project": project, "window": time_window})
         result = self.query(query)
         return result.get("status") == "success" and len(result.get("data", {}).get("result", [])) > 0
 
+    def bulk_pulumi_snapshot(self, projects):
+        """
+        Fetch the Pulumi deployment metrics for several projects at once
+
+        Issues a single union query covering every metric of all projects,
+        instead of several queries per project.
+
+        Args:
+            projects: Names of the Pulumi projects
+
+        Returns:
+            Dict mapping each project that has metrics to a dict with its
+            "success" (latest value within the last hour, 0 if any of the
+            project's series failed), "duration" and
+            "resources" values; metrics that aren't present are omitted
+        """
+        project_regex = _label_regex(projects)
+        queries = {
+            # Latest sample of each series within the hour; min so a failure
+            # in any of a project's series is not hidden behind a success
+            "success": f'min by (project) (last_over_time(pulumi_deployment_success{{project=~"{project_regex}"}}[1h]))',
+            "duration": f'max by (project) (pulumi_deployment_duration_seconds{{project=~"{project_regex}"}})',
+            "resources": f'max by (project) (pulumi_resources_created{{project=~"{project_regex}"}})',
+        }
+        results = self._helper.query_union(queries)
+
+        snapshot = {}
+        for key, result in results.items():
+            if result.get("status") != "success":
+                continue
+            for item in result.get("data", {}).get("result", []):
+                try:
+                    value = float(item["value"][1])
+                except (KeyError, IndexError, ValueError):
+                    continue
+                snapshot.setdefault(item.get("metric", {}).get("project"), {})[key] = value
+        return snapshot
+
     def deployment_ready(self, namespace, deployment_name):
         """
         Check if a Kubernetes deployment is ready
@@ -98,12 +199,7 @@ class PrometheusModule:
         Returns:
             Boolean indicating if the deployment is ready
         """
-        query = (
-            f'kube_deployment_status_replicas_available{{namespace="{namespace}",'
-            f'deployment="{deployment_name}"}} == '
-            f'kube_deployment_status_replicas_desired{{namespace="{namespace}",'
-            f'deployment="{deployment_name}"}}'
-        )
+        query = _TPL_DEPLOYMENT_READY.format_map({"ns": namespace, "name": deployment_name})
         return self.check_value(query, '==', 1)
 
     def pod_restarts(self, namespace, pod_name_pattern):
@@ -117,15 +213,15 @@ class PrometheusModule:
         Returns:
             Number of restarts or -1 if query fails
         """
-        query = f'sum(kube_pod_container_status_restarts_total{{namespace="{namespace}",pod=~"{pod_name_pattern}"}})'
+        query = _TPL_POD_RESTARTS.format_map({"ns": namespace, "pattern": pod_name_pattern})
         result = self.query(query)
 
-        if result.get("status") == "success" and result.get("data", {}).get("result"):
-            try:
-                return float(result["data"]["result"][0]["value"][1])
-            except (KeyError, IndexError, ValueError):
-                pass
-        return -1
+        try:
+            values = extract_values(result)
+        except (KeyError, IndexError, ValueError):
+            return -1
+        # Total over every returned series, not just the first
+        return math.fsum(values) if len(values) else -1
 
     def node_resources(self, node_name):
         """
@@ -137,17 +233,16 @@ class PrometheusModule:
         Returns:
             Dict with resource usage information
         """
-        cpu_query = f'sum(rate(node_cpu_seconds_total{{mode!="idle",instance=~"{node_name}.*"}}[5m]))'
-        memory_query = f'node_memory_MemTotal_bytes{{instance=~"{node_name}.*"}} - node_memory_MemAvailable_bytes{{instance=~"{node_name}.*"}}'
-        disk_query = f'node_filesystem_size_bytes{{instance=~"{node_name}.*",mountpoint="/"}} - node_filesystem_free_bytes{{instance=~"{node_name}.*",mountpoint="/"}}'
+        args = {"node": node_name}
 
-        cpu_result = self.query(cpu_query)
-        memory_result = self.query(memory_query)
-        disk_result = self.query(disk_query)
+        # One round-trip for all three
+        results = self._helper.query_union(
+            {key: tpl.format_map(args) for key, tpl in _TPL_NODE_RESOURCES.items()}
+        )
 
-        cpu_value = self._extract_value(cpu_result)
-        memory_value = self._extract_value(memory_result)
-        disk_value = self._extract_value(disk_result)
+        cpu_value = self._extract_value(results["cpu"])
+        memory_value = self._extract_value(results["memory"])
+        disk_value = self._extract_value(results["disk"])
 
         return {
             "cpu": cpu_value,
@@ -157,12 +252,39 @@ class PrometheusModule:
 
     def _extract_value(self, query_result):
         """Extract a numeric value from a Prometheus query result"""
-        if query_result.get("status") == "success" and query_result.get("data", {}).get("result"):
-            try:
-                return float(query_result["data"]["result"][0]["value"][1])
-            except (KeyError, IndexError, ValueError):
-                pass
-        return None
+        try:
+            values = extract_values(query_result)
+        except (KeyError, IndexError, ValueError):
+            return None
+        return float(values[0]) if len(values) else None
+
+
+class CachedPromClient(PrometheusModule):
+    """
+    PrometheusModule that reuses lookups within a test session.
+
+    Query results are already cached for a short TTL by PrometheusTestHelper;
+    on top of that, metric existence checks and the metric name list are
+    memoized for the session, so tests asking about the same metrics don't
+    each pay a round-trip to Prometheus.
+    """
+
+    def __init__(self, host=None):
+        super().__init__(host)
+        self.check_metric_exists = functools.lru_cache(maxsize=512)(self.check_metric_exists)
+        self._metric_names = None
+
+    def metric_names_set(self):
+        """All metric names known to Prometheus, fetched once per session"""
+        if not self._metric_names:
+            self._metric_names = super().metric_names_set()
+        return self._metric_names
+
+
+@pytest.fixture(scope="session")
+def prom():
+    """Session-wide Prometheus client whose query results are shared between tests"""
+    return CachedPromClient()
 
 
 # Register the module